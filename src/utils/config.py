@@ -31,6 +31,8 @@ class FileConfig:
     metadata_schema_file: str
     target_filename_mask: str
     max_file_size: int
+    hash_algorithm: str  # 'xxh3' or 'md5'
+    listing_cache_ttl: float  # Seconds the web dashboard reuses directory listings
 
 
 @dataclass
@@ -150,7 +152,9 @@ def load_config() -> AppConfig:
     file_config = FileConfig(
         metadata_schema_file=os.getenv("METADATA_SCHEMA_FILE", ""),
         target_filename_mask=os.getenv("TARGET_FILENAME_MASK", ""),
-        max_file_size=int(os.getenv("MAX_FILE_SIZE", "15728640"))  # Default 15MB
+        max_file_size=int(os.getenv("MAX_FILE_SIZE", "15728640")),  # Default 15MB
+        hash_algorithm=os.getenv("FILE_HASH_ALGORITHM", "xxh3").lower(),
+        listing_cache_ttl=float(os.getenv("LISTING_CACHE_TTL", "5"))
     )
 
     openai_config = OpenAIConfig(
@@ -197,24 +197,32 @@ def save_json_file(data: Dict[str, Any], path: Union[str, Path]) -> None:
     # Ensure directory exists
     path.parent.mkdir(exist_ok=True, parents=True)
 
+    # Encode once so the file is written with a single write() call
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    # Use atomic write to prevent corruption: write a temp file in the same
+    # directory, flush it to disk and rename it over the target
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
     try:
-        # Use atomic write to prevent corruption
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, dir=str(path.parent)) as temp:
-            json.dump(data, temp, ensure_ascii=False, indent=2)
-            temp_path = temp.name
-
-        # Rename temp file to target file
-        shutil.move(temp_path, path)
-    except UnicodeEncodeError:
-        # Fall back to binary mode with explicit UTF-8 encoding if Unicode error occurs
-        logger.warning(f"Unicode encode error occurred, falling back to binary mode for {path}")
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, dir=str(path.parent)) as temp:
-            json_str = json.dumps(data, ensure_ascii=False, indent=2)
-            temp.write(json_str.encode('utf-8'))
-            temp_path = temp.name
-
-        # Rename temp file to target file
-        shutil.move(temp_path, path)
+        try:
+            view = memoryview(payload)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if hasattr(os, 'fdatasync'):
+                os.fdatasync(fd)
+            else:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 def load_yaml_file(path: Union[str, Path]) -> Dict[str, Any]:
@@ -7,11 +7,12 @@ This module provides functionality to track running processes.
 import os
 import time
 import json
+import logging
 import threading
 import psutil
 from datetime import datetime
 from src.utils.logging import get_logger
-from src.utils.paths import get_path_manager
+from src.utils.paths import get_path_manager, save_json_file
 
 # Get logger
 logger = get_logger('process_tracker')
@@ -75,9 +76,8 @@ class ProcessTracker:
         Save processes to file.
         """
         try:
-            with open(self.processes_file, 'w', encoding='utf-8') as f:
-                json.dump(self.processes, f, indent=4)
-            logger.info(f"Сохранено процессов в файл: {len(self.processes)}")
+            save_json_file(self.processes, self.processes_file)
+            logger.info("Сохранено процессов в файл: %d", len(self.processes))
         except Exception as e:
             logger.error(f"Ошибка сохранения процессов: {str(e)}")
 
@@ -94,10 +94,10 @@ class ProcessTracker:
         try:
             process = psutil.Process(pid)
             is_running = process.is_running()
-            logger.debug(f"Проверка процесса: PID={pid}, is_running={is_running}")
+            logger.debug("Проверка процесса: PID=%s, is_running=%s", pid, is_running)
             return is_running
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            logger.debug(f"Процесс не существует или недоступен: PID={pid}")
+            logger.debug("Процесс не существует или недоступен: PID=%s", pid)
             return False
 
     def add_process(self, pid, name, start_time=None, status="running", details=None):
@@ -126,7 +126,7 @@ class ProcessTracker:
                 }
 
                 self._save_processes()
-                logger.info(f"Добавлен процесс {name} (PID: {pid}) в трекер")
+                logger.info("Добавлен процесс %s (PID: %s) в трекер", name, pid)
             except Exception as e:
                 logger.error(f"Ошибка при добавлении процесса: {name} (PID: {pid}), error={str(e)}")
 
@@ -145,18 +145,19 @@ class ProcessTracker:
                 if pid_str in self.processes:
                     if status is not None:
                         self.processes[pid_str]["status"] = status
-                        logger.info(f"Обновлен статус процесса: PID={pid}, status={status}")
+                        logger.info("Обновлен статус процесса: PID=%s, status=%s", pid, status)
 
                     if details is not None:
                         if "details" not in self.processes[pid_str]:
                             self.processes[pid_str]["details"] = {}
 
                         self.processes[pid_str]["details"].update(details)
-                        logger.info(f"Обновлены детали процесса: PID={pid}")
+                        logger.info("Обновлены детали процесса: PID=%s", pid)
 
                     self.processes[pid_str]["last_updated"] = time.time()
                     self._save_processes()
-                    logger.debug(f"Обновлен процесс {self.processes[pid_str]['name']} (PID: {pid})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Обновлен процесс %s (PID: %s)", self.processes[pid_str].get('name'), pid)
                 else:
                     logger.warning(f"Процесс не найден при обновлении: PID={pid}")
             except Exception as e:
@@ -198,9 +199,9 @@ class ProcessTracker:
         pid_str = str(pid)
         process = self.processes.get(pid_str)
         if process:
-            logger.debug(f"Получен процесс: PID={pid}, name={process.get('name')}")
+            logger.debug("Получен процесс: PID=%s, name=%s", pid, process.get('name'))
         else:
-            logger.debug(f"Процесс не найден: PID={pid}")
+            logger.debug("Процесс не найден: PID=%s", pid)
         return process
 
     def get_all_processes(self):
@@ -284,9 +285,9 @@ class ProcessTracker:
             process = self.get_process(pid)
             if process:
                 status = process.get("status", "unknown")
-                logger.debug(f"Статус процесса: PID={pid}, status={status}")
+                logger.debug("Статус процесса: PID=%s, status=%s", pid, status)
                 return status
-            logger.debug(f"Процесс не найден при получении статуса: PID={pid}")
+            logger.debug("Процесс не найден при получении статуса: PID=%s", pid)
             return None
         except Exception as e:
             logger.error(f"Ошибка при получении статуса процесса: PID={pid}, error={str(e)}")
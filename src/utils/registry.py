@@ -9,7 +9,7 @@ import os
 import json
 import time
 import hashlib
-from datetime import datetime
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, List, Set, Optional, Union
 
@@ -17,9 +17,23 @@ from .config import get_config
 from .logging import get_logger
 from .paths import get_path_manager
 from .paths import load_json_file, save_json_file
+from .timestamps import now_iso
+
+try:
+    import xxhash
+except ImportError:  # xxhash is only needed for the xxh3 algorithm
+    xxhash = None
 
 logger = get_logger(__name__)
 
+# Supported file hash algorithms; entries without an "algo" field are md5
+HASH_ALGORITHMS = ('xxh3', 'md5')
+DEFAULT_HASH_ALGORITHM = 'xxh3'
+LEGACY_HASH_ALGORITHM = 'md5'
+
+# Chunk size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 class FileRegistry:
     """
@@ -49,6 +63,16 @@ class FileRegistry:
         if "hashes" not in self.file_hashes:
             self.file_hashes["hashes"] = {}
 
+        # Hash algorithm used for new entries
+        self.hash_algorithm = get_config().file.hash_algorithm
+        if self.hash_algorithm not in HASH_ALGORITHMS:
+            logger.warning(f"Unknown hash algorithm '{self.hash_algorithm}', using {DEFAULT_HASH_ALGORITHM}")
+            self.hash_algorithm = DEFAULT_HASH_ALGORITHM
+        if self.hash_algorithm == 'xxh3' and xxhash is None:
+            logger.warning(f"xxhash is not installed, using {LEGACY_HASH_ALGORITHM} for file hashes")
+            self.hash_algorithm = LEGACY_HASH_ALGORITHM
+        self._count_hash_algorithms()
+
         logger.info(f"File registry initialized with {len(self.processed['files'])} processed and {len(self.uploaded['files'])} uploaded files")
 
     def reload(self):
@@ -63,6 +87,7 @@ class FileRegistry:
         # Initialize file_hashes if needed
         if "hashes" not in self.file_hashes:
             self.file_hashes["hashes"] = {}
+        self._count_hash_algorithms()
 
         logger.info(f"File registry reloaded with {len(self.processed['files'])} processed and {len(self.uploaded['files'])} uploaded files")
 
@@ -81,9 +106,9 @@ class FileRegistry:
                 return load_json_file(file_path)
             except Exception as e:
                 logger.error(f"Error loading registry from {file_path}: {str(e)}")
-                return {"files": {}, "last_updated": datetime.now().isoformat()}
+                return {"files": {}, "last_updated": now_iso()}
         else:
-            return {"files": {}, "last_updated": datetime.now().isoformat()}
+            return {"files": {}, "last_updated": now_iso()}
 
     def _save_registry(self, registry: Dict[str, Any], file_path: Path) -> None:
         """
@@ -93,10 +118,10 @@ class FileRegistry:
             registry (Dict[str, Any]): Registry dictionary
             file_path (Path): Path to registry file
         """
-        registry["last_updated"] = datetime.now().isoformat()
+        registry["last_updated"] = now_iso()
         try:
             save_json_file(registry, file_path)
-            logger.debug(f"Registry saved to {file_path}")
+            logger.debug("Registry saved to %s", file_path)
         except Exception as e:
             logger.error(f"Error saving registry to {file_path}: {str(e)}")
 
@@ -133,11 +158,11 @@ class FileRegistry:
             metadata (Optional[Dict[str, Any]]): Additional metadata to store
         """
         self.processed["files"][filename] = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "metadata": metadata or {}
         }
         self._save_registry(self.processed, self.processed_file)
-        logger.debug(f"Marked {filename} as processed")
+        logger.debug("Marked %s as processed", filename)
 
     def mark_as_uploaded(self, filename: str, target_url: Optional[str] = None) -> None:
         """
@@ -148,11 +173,11 @@ class FileRegistry:
             target_url (Optional[str]): URL of the uploaded file in SharePoint
         """
         self.uploaded["files"][filename] = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "target_url": target_url
         }
         self._save_registry(self.uploaded, self.uploaded_file)
-        logger.debug(f"Marked {filename} as uploaded")
+        logger.debug("Marked %s as uploaded", filename)
 
     def get_processed_files(self) -> List[str]:
         """
@@ -213,7 +238,7 @@ class FileRegistry:
         if filename in self.processed["files"]:
             del self.processed["files"][filename]
             self._save_registry(self.processed, self.processed_file)
-            logger.debug(f"Removed {filename} from processed registry")
+            logger.debug("Removed %s from processed registry", filename)
             return True
         return False
 
@@ -230,7 +255,7 @@ class FileRegistry:
         if filename in self.uploaded["files"]:
             del self.uploaded["files"][filename]
             self._save_registry(self.uploaded, self.uploaded_file)
-            logger.debug(f"Removed {filename} from uploaded registry")
+            logger.debug("Removed %s from uploaded registry", filename)
             return True
         return False
 
@@ -238,12 +263,14 @@ class FileRegistry:
         """
         Clear all registries including file hashes.
         """
-        self.processed = {"files": {}, "last_updated": datetime.now().isoformat()}
-        self.uploaded = {"files": {}, "last_updated": datetime.now().isoformat()}
-        self.file_hashes = {"hashes": {}, "last_updated": datetime.now().isoformat()}
+        now = now_iso()
+        self.processed = {"files": {}, "last_updated": now}
+        self.uploaded = {"files": {}, "last_updated": now}
+        self.file_hashes = {"hashes": {}, "last_updated": now}
         self._save_registry(self.processed, self.processed_file)
         self._save_registry(self.uploaded, self.uploaded_file)
         self._save_registry(self.file_hashes, self.file_hashes_file)
+        self._count_hash_algorithms()
         logger.info("All registries cleared including file hashes")
 
     def map_filename(self, original_filename: str, target_filename: str) -> None:
@@ -264,7 +291,7 @@ class FileRegistry:
         # Add mapping
         self.processed["filename_mapping"][original_filename] = target_filename
         self._save_registry(self.processed, self.processed_file)
-        logger.debug(f"Mapped {original_filename} to {target_filename}")
+        logger.debug("Mapped %s to %s", original_filename, target_filename)
 
     def get_mapped_filename(self, original_filename: str) -> Optional[str]:
         """
@@ -281,23 +308,29 @@ class FileRegistry:
 
         return self.processed["filename_mapping"].get(original_filename)
 
-    def calculate_file_hash(self, file_path: str) -> str:
+    def calculate_file_hash(self, file_path: str, algorithm: Optional[str] = None) -> str:
         """
-        Calculate MD5 hash of a file.
+        Calculate the content hash of a file.
 
         Args:
             file_path (str): Path to the file
+            algorithm (Optional[str]): Hash algorithm ('xxh3' or 'md5'),
+                defaults to the configured algorithm
 
         Returns:
-            str: MD5 hash of the file
+            str: Hex digest of the file
         """
+        algorithm = algorithm or self.hash_algorithm
         try:
-            md5_hash = hashlib.md5()
+            if algorithm == LEGACY_HASH_ALGORITHM:
+                file_hash = hashlib.md5()
+            else:
+                file_hash = xxhash.xxh3_128()
             with open(file_path, "rb") as f:
                 # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
-                    md5_hash.update(chunk)
-            return md5_hash.hexdigest()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    file_hash.update(chunk)
+            return file_hash.hexdigest()
         except Exception as e:
             logger.error(f"Error calculating hash for {file_path}: {str(e)}")
             # Return a unique string based on filename and size as fallback
@@ -307,6 +340,61 @@ class FileRegistry:
             except:
                 return f"fallback_{os.path.basename(file_path)}"
 
+    def _count_hash_algorithms(self) -> None:
+        """
+        Count the registry entries made with each hash algorithm.
+
+        Lookups only rehash a file with the algorithms that still have entries.
+        """
+        self._algorithm_counts = Counter(
+            info.get("algo", LEGACY_HASH_ALGORITHM)
+            for file_hash, info in self.file_hashes["hashes"].items()
+            if not file_hash.startswith("fallback_")
+        )
+
+    def _find_hash_entry(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the registry entry for a file by its hash.
+
+        Entries registered with another algorithm are looked up under each
+        algorithm still present in the registry and migrated to the current
+        algorithm when found.
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            Optional[Dict[str, Any]]: File information or None if not found
+        """
+        hashes = self.file_hashes["hashes"]
+        file_hash = self.calculate_file_hash(file_path)
+        info = hashes.get(file_hash)
+        if info is not None:
+            return info
+
+        for algorithm, count in self._algorithm_counts.items():
+            if algorithm == self.hash_algorithm or count <= 0 or algorithm not in HASH_ALGORITHMS:
+                continue
+            if algorithm == 'xxh3' and xxhash is None:
+                continue
+
+            old_hash = self.calculate_file_hash(file_path, algorithm)
+            info = hashes.get(old_hash)
+            if info is None or info.get("algo", LEGACY_HASH_ALGORITHM) != algorithm:
+                continue
+
+            # Migrate the entry to the current algorithm
+            del hashes[old_hash]
+            info["algo"] = self.hash_algorithm
+            hashes[file_hash] = info
+            self._save_registry(self.file_hashes, self.file_hashes_file)
+            self._algorithm_counts[algorithm] -= 1
+            self._algorithm_counts[self.hash_algorithm] += 1
+            logger.debug("Migrated hash for %s from %s to %s", info.get("filename"), algorithm, self.hash_algorithm)
+            return info
+
+        return None
+
     def is_file_processed_by_hash(self, file_path: str) -> bool:
         """
         Check if a file has been processed by its hash.
@@ -317,8 +405,7 @@ class FileRegistry:
         Returns:
             bool: True if a file with the same hash has been processed
         """
-        file_hash = self.calculate_file_hash(file_path)
-        return file_hash in self.file_hashes["hashes"]
+        return self._find_hash_entry(file_path) is not None
 
     def register_file_hash(self, file_path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -334,13 +421,20 @@ class FileRegistry:
         file_hash = self.calculate_file_hash(file_path)
         filename = os.path.basename(file_path)
 
+        if not file_hash.startswith("fallback_"):
+            previous = self.file_hashes["hashes"].get(file_hash)
+            if previous is not None:
+                self._algorithm_counts[previous.get("algo", LEGACY_HASH_ALGORITHM)] -= 1
+            self._algorithm_counts[self.hash_algorithm] += 1
+
         self.file_hashes["hashes"][file_hash] = {
             "filename": filename,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
+            "algo": self.hash_algorithm,
             "metadata": metadata or {}
         }
         self._save_registry(self.file_hashes, self.file_hashes_file)
-        logger.debug(f"Registered hash for {filename}: {file_hash}")
+        logger.debug("Registered hash for %s: %s", filename, file_hash)
 
         return file_hash
 
@@ -354,8 +448,7 @@ class FileRegistry:
         Returns:
             Optional[Dict[str, Any]]: File information or None if not found
         """
-        file_hash = self.calculate_file_hash(file_path)
-        return self.file_hashes["hashes"].get(file_hash)
+        return self._find_hash_entry(file_path)
 
     def get_processing_statistics(self) -> Dict[str, Any]:
         """
@@ -368,17 +461,13 @@ class FileRegistry:
         uploaded_count = len(self.uploaded["files"])
         pending_upload = processed_count - uploaded_count
 
-        # Count files by date
-        processed_by_date = {}
-        uploaded_by_date = {}
-
-        for filename, info in self.processed["files"].items():
-            date = info["timestamp"].split("T")[0]
-            processed_by_date[date] = processed_by_date.get(date, 0) + 1
-
-        for filename, info in self.uploaded["files"].items():
-            date = info["timestamp"].split("T")[0]
-            uploaded_by_date[date] = uploaded_by_date.get(date, 0) + 1
+        # Count files by date (the date is the first 10 chars of the ISO timestamp)
+        processed_by_date = dict(Counter(
+            info["timestamp"][:10] for info in self.processed["files"].values()
+        ))
+        uploaded_by_date = dict(Counter(
+            info["timestamp"][:10] for info in self.uploaded["files"].values()
+        ))
 
         return {
             "processed_count": processed_count,
@@ -386,7 +475,7 @@ class FileRegistry:
             "pending_upload": pending_upload,
             "processed_by_date": processed_by_date,
             "uploaded_by_date": uploaded_by_date,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": now_iso()
         }
 
 
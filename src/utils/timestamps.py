@@ -0,0 +1,31 @@
+"""
+Timestamps Module
+
+This module provides a cached ISO 8601 timestamp for code that stamps many
+records or responses within the same second.
+"""
+
+import time
+from datetime import datetime
+
+# Last formatted timestamp, reused while the wall-clock second is unchanged
+_iso_cache = (None, None)
+
+
+def now_iso() -> str:
+    """
+    Get the current local time as an ISO 8601 string with second precision.
+
+    The formatted string is cached per second, so bulk registry updates and
+    frequently polled API responses do not build a new datetime every time.
+
+    Returns:
+        str: Current time in ISO format
+    """
+    global _iso_cache
+    second = int(time.time())
+    cached_second, cached_value = _iso_cache
+    if cached_second != second:
+        cached_value = datetime.fromtimestamp(second).isoformat()
+        _iso_cache = (second, cached_value)
+    return cached_value
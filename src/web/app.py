@@ -5,6 +5,7 @@ This module provides the Flask application for the web interface.
 """
 
 import os
+import functools
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 from datetime import datetime
 from flask_wtf.csrf import CSRFProtect
@@ -19,6 +20,16 @@ logger = get_logger('web_interface')
 # Initialize CSRF protection
 csrf = CSRFProtect()
 
+# Units used by the filesize filter, indexed by power of 1024
+FILESIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_isoformat(value):
+    """Parse an ISO formatted datetime string, memoized per string."""
+    return datetime.fromisoformat(value)
+
+
 def create_app(test_config=None):
     """
     Create and configure the Flask application.
@@ -35,6 +46,9 @@ def create_app(test_config=None):
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
         UPLOAD_FOLDER=get_path_manager().downloads_dir,
         MAX_CONTENT_LENGTH=16 * 1024 * 1024,  # 16 MB max upload size
+        # Internal nginx location serving the logs directory; when set, log
+        # downloads are handed to nginx via X-Accel-Redirect
+        LOG_ACCEL_REDIRECT_PREFIX=os.environ.get('LOG_ACCEL_REDIRECT_PREFIX'),
     )
 
     # Initialize CSRF protection
@@ -69,7 +83,7 @@ def create_app(test_config=None):
             return ""
         if isinstance(value, str):
             try:
-                value = datetime.fromisoformat(value)
+                value = _parse_isoformat(value)
             except ValueError:
                 return value
         return value.strftime(format)
@@ -80,12 +94,9 @@ def create_app(test_config=None):
         if value is None:
             return "0 B"
 
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if value < 1024.0:
-                return f"{value:.1f} {unit}"
-            value /= 1024.0
-
-        return f"{value:.1f} PB"
+        # Pick the unit directly from the bit length instead of dividing in a loop
+        exponent = min(max(int(value).bit_length() - 1, 0), 50) // 10
+        return f"{value / (1 << (exponent * 10)):.1f} {FILESIZE_UNITS[exponent]}"
 
     # Add context processors
     @app.context_processor
@@ -5,63 +5,181 @@ This module provides caching functionality for file operations.
 """
 
 import time
-from collections import OrderedDict
-from threading import RLock
+import heapq
+from dataclasses import dataclass, field
+from threading import Lock
 from src.utils.logging import get_logger
 
+# lru-dict keeps the LRU order in C; fall back to a plain dict without it
+try:
+    from lru import LRU
+    _HAS_C_LRU = True
+except ImportError:
+    LRU = None
+    _HAS_C_LRU = False
+
 # Get logger
 logger = get_logger('web.file_cache')
 
 
+# Marker for keys that are not in a shard
+_MISSING = object()
+
+
+@dataclass
+class _Shard:
+    """One independently locked partition of an LRUCache."""
+    max_size: int
+    cache: dict = field(default_factory=dict)
+    expiry: dict = field(default_factory=dict)
+    expiry_heap: list = field(default_factory=list)
+    lock: Lock = field(default_factory=Lock)
+    hits: int = 0
+    misses: int = 0
+
+
 class LRUCache:
     """
     Thread-safe LRU (Least Recently Used) cache implementation.
     
     This cache has a fixed maximum size and will evict the least recently used
     items when the size limit is reached.
+
+    Keys are spread over a number of shards, each with its own lock and LRU
+    order, so concurrent requests touching different keys do not contend.
+    Eviction is local to a shard. When lru-dict is installed the ordered
+    storage of each shard is a C-level LRU that promotes and evicts by
+    itself; otherwise LRU order is the insertion order of a plain dict and a
+    key is moved to the end by popping and reinserting it.
+
+    Values are stored as-is; expiry deadlines (monotonic nanoseconds) are
+    kept in a separate dict and a min-heap, so expired entries can be swept
+    from the earliest deadline without scanning live ones.
+
+    The shard locks are not reentrant: public methods must not call each
+    other while holding one.
     """
     
-    def __init__(self, max_size=1000, ttl=3600):
+    def __init__(self, max_size=1000, ttl=3600, shards=16):
         """
         Initialize the LRU cache.
         
         Args:
             max_size (int): Maximum number of items in the cache
             ttl (int): Time to live in seconds (default: 1 hour)
+            shards (int): Number of shards, must be a power of two
         """
-        self.cache = OrderedDict()
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError(f"Number of shards must be a power of two: {shards}")
+
         self.max_size = max_size
         self.ttl = ttl
-        self.lock = RLock()
-        self.hits = 0
-        self.misses = 0
+        self._ttl_ns = int(ttl * 1_000_000_000)
+        self.shards = [self._create_shard(max(1, max_size // shards)) for _ in range(shards)]
+        self._shard_mask = shards - 1
+
+    @staticmethod
+    def _create_shard(max_size):
+        """
+        Create a shard, backed by lru-dict when it is available.
+
+        Args:
+            max_size (int): Maximum number of items in the shard
+
+        Returns:
+            _Shard: New empty shard
+        """
+        shard = _Shard(max_size=max_size)
+        if _HAS_C_LRU:
+            # Keys evicted by the C LRU must not leave their deadline behind
+            expiry = shard.expiry
+            shard.cache = LRU(max_size, callback=lambda key, value: expiry.pop(key, None))
+        return shard
+
+    def _get_shard(self, key):
+        """
+        Get the shard responsible for a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            _Shard: Shard holding the key
+        """
+        return self.shards[hash(key) & self._shard_mask]
+
+    @staticmethod
+    def _remove(shard, key):
+        """
+        Remove a key from a shard. The caller must hold the shard lock.
+
+        Args:
+            shard (_Shard): Shard holding the key
+            key: Cache key
+        """
+        del shard.cache[key]
+        shard.expiry.pop(key, None)
+
+    @staticmethod
+    def _sweep_expired(shard, now):
+        """
+        Evict entries whose deadline has passed. The caller must hold the shard lock.
+
+        Heap entries left behind by updated or removed keys are discarded.
+
+        Args:
+            shard (_Shard): Shard to sweep
+            now (int): Current monotonic time in nanoseconds
+        """
+        heap = shard.expiry_heap
+        while heap and heap[0][0] <= now:
+            deadline, key = heapq.heappop(heap)
+            if shard.expiry.get(key) == deadline:
+                del shard.cache[key]
+                del shard.expiry[key]
         
-    def get(self, key):
+    def get(self, key, default=None):
         """
         Get an item from the cache.
+
+        Cached values may be falsy (empty lists, empty dicts); callers should
+        compare the result with None, or pass a sentinel as default when
+        None itself may be cached.
         
         Args:
             key: Cache key
+            default: Value returned when the key is missing or expired
             
         Returns:
-            The cached value or None if not found or expired
+            The cached value or default if not found or expired
         """
-        with self.lock:
-            if key not in self.cache:
-                self.misses += 1
-                return None
-                
-            # Check if item has expired
-            item, timestamp = self.cache[key]
-            if self.ttl > 0 and time.time() - timestamp > self.ttl:
-                del self.cache[key]
-                self.misses += 1
-                return None
-                
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            self.hits += 1
-            return item
+        shard = self._get_shard(key)
+        with shard.lock:
+            if _HAS_C_LRU:
+                # The C LRU promotes the key on lookup
+                item = shard.cache.get(key, _MISSING)
+                if (item is not _MISSING and self._ttl_ns > 0
+                        and shard.expiry[key] <= time.monotonic_ns()):
+                    self._remove(shard, key)
+                    item = _MISSING
+            else:
+                item = shard.cache.pop(key, _MISSING)
+                if item is not _MISSING:
+                    # Check if item has expired
+                    if self._ttl_ns > 0 and shard.expiry[key] <= time.monotonic_ns():
+                        del shard.expiry[key]
+                        item = _MISSING
+                    else:
+                        # Reinsert at the end (most recently used)
+                        shard.cache[key] = item
+
+        # Statistics are advisory, so the counters are updated outside the lock
+        if item is _MISSING:
+            shard.misses += 1
+            return default
+
+        shard.hits += 1
+        return item
             
     def set(self, key, value):
         """
@@ -74,15 +192,30 @@ class LRUCache:
         Returns:
             None
         """
-        with self.lock:
-            if key in self.cache:
-                self.cache.move_to_end(key)
-                
-            self.cache[key] = (value, time.time())
+        shard = self._get_shard(key)
+        with shard.lock:
+            if _HAS_C_LRU:
+                # Assignment promotes the key and evicts the oldest one if full
+                shard.cache[key] = value
+            else:
+                # Pop first so the key is reinserted at the end (most recently used)
+                shard.cache.pop(key, None)
+                shard.cache[key] = value
+
+            if self._ttl_ns > 0:
+                now = time.monotonic_ns()
+                deadline = now + self._ttl_ns
+                shard.expiry[key] = deadline
+                heapq.heappush(shard.expiry_heap, (deadline, key))
+
+                # Drop entries that have already expired
+                self._sweep_expired(shard, now)
             
-            # Evict oldest items if over size limit
-            while len(self.cache) > self.max_size:
-                self.cache.popitem(last=False)
+            # Evict oldest items if over size limit (only needed for plain dicts)
+            while len(shard.cache) > shard.max_size:
+                oldest_key = next(iter(shard.cache))
+                del shard.cache[oldest_key]
+                shard.expiry.pop(oldest_key, None)
                 
     def delete(self, key):
         """
@@ -94,9 +227,10 @@ class LRUCache:
         Returns:
             bool: True if item was removed, False if not found
         """
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
+        shard = self._get_shard(key)
+        with shard.lock:
+            if key in shard.cache:
+                self._remove(shard, key)
                 return True
             return False
             
@@ -107,8 +241,11 @@ class LRUCache:
         Returns:
             None
         """
-        with self.lock:
-            self.cache.clear()
+        for shard in self.shards:
+            with shard.lock:
+                shard.cache.clear()
+                shard.expiry.clear()
+                shard.expiry_heap.clear()
             
     def get_stats(self):
         """
@@ -117,22 +254,30 @@ class LRUCache:
         Returns:
             dict: Cache statistics
         """
-        with self.lock:
-            total = self.hits + self.misses
-            hit_rate = (self.hits / total) * 100 if total > 0 else 0
-            
-            return {
-                'size': len(self.cache),
-                'max_size': self.max_size,
-                'hits': self.hits,
-                'misses': self.misses,
-                'hit_rate': hit_rate
-            }
+        # Statistics are advisory; read them without taking the shard locks
+        size = sum(len(shard.cache) for shard in self.shards)
+        hits = sum(shard.hits for shard in self.shards)
+        misses = sum(shard.misses for shard in self.shards)
+
+        total = hits + misses
+        hit_rate = (hits / total) * 100 if total > 0 else 0
+        
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hit_rate
+        }
 
 
 # Create global file cache instance
 file_cache = LRUCache(max_size=1000, ttl=300)  # 5 minute TTL
 
+# Cache for negative lookups (files that were not found). The short TTL lets
+# files that appear later be picked up without explicit invalidation.
+negative_cache = LRUCache(max_size=1000, ttl=60)  # 1 minute TTL
+
 
 def get_file_cache():
     """
@@ -142,3 +287,13 @@ def get_file_cache():
         LRUCache: Global file cache instance
     """
     return file_cache
+
+
+def get_negative_cache():
+    """
+    Get the global negative lookup cache instance.
+
+    Returns:
+        LRUCache: Global negative lookup cache instance
+    """
+    return negative_cache
@@ -5,23 +5,61 @@ This module provides utilities for managing files in the web interface.
 """
 
 import os
+import io
 import glob
-import json
+import heapq
 import time
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from werkzeug.utils import secure_filename
 from src.utils.logging import get_logger
-from src.web.utils import safe_path_join, log_with_context, Timer
-from src.web.file_cache import get_file_cache
-from src.web.exceptions import FileValidationError, PathSecurityError
+from src.web.utils import safe_path_join, log_with_context, read_json_file, Timer
+from src.web.file_cache import get_file_cache, get_negative_cache
+from src.web import linux_statx
+from src.web.exceptions import FileValidationError
 
 # Get logger
 logger = get_logger('web.file_manager')
 
+# Allowed suffixes in priority order, checked with a single str.endswith call
+_ALLOWED_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+
 # Define allowed file extensions
-ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp'}
+ALLOWED_EXTENSIONS = frozenset(suffix[1:] for suffix in _ALLOWED_SUFFIXES)
+
+# Candidate suffixes for an original photo: the bare name first
+_ORIGINAL_SUFFIXES = ('',) + _ALLOWED_SUFFIXES
+
+# Pagination info passed to templates; immutable and cheap to build
+Pagination = namedtuple(
+    'Pagination',
+    'page per_page total total_pages has_prev has_next prev_page next_page pages'
+)
+
+# Copy buffer for saving uploads; Werkzeug's default of 16 KiB means many
+# small reads and writes for multi-megabyte photos
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Largest first page served from a partial top-N selection instead of a full sort
+TOP_N_LIMIT = 32
+
+# Directories with at least this many files are stat-ed on several threads,
+# PARALLEL_STAT_CHUNK files per task
+PARALLEL_STAT_THRESHOLD = 64
+PARALLEL_STAT_CHUNK = 32
+
+# Small pool for directory scans that block on (possibly networked) storage
+_scan_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dir-scan')
+
+# Pool for stat-ing the files of large directories
+_stat_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='dir-stat')
+
+# Pool for loading several sidecar metadata files at once
+_metadata_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='metadata-load')
 
 
 def allowed_file(filename):
@@ -34,7 +72,203 @@ def allowed_file(filename):
     Returns:
         bool: True if file has an allowed extension
     """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+def _stat_entries(entries, dir_fd=None, follow_symlinks=False):
+    """
+    Get the size and modification time of directory entries.
+
+    Args:
+        entries (list): DirEntry objects of files
+        dir_fd (int): Descriptor of their directory to stat them with statx,
+            or None to use DirEntry.stat()
+        follow_symlinks (bool): Stat the targets of symlinks
+
+    Returns:
+        list: (size, mtime_ns) per entry, None for entries that no longer exist
+    """
+    stats = []
+    for entry in entries:
+        try:
+            if dir_fd is not None:
+                stats.append(linux_statx.fast_stat(dir_fd, entry.name, follow_symlinks))
+            else:
+                # DirEntry caches the result, so this is the only stat
+                stat = entry.stat(follow_symlinks=follow_symlinks)
+                stats.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stats.append(None)
+    return stats
+
+
+def stat_files(directory, entries, follow_symlinks=False):
+    """
+    Get the size and modification time of files listed from a directory.
+
+    On Linux the files are stat-ed with statx relative to one descriptor of
+    the directory, so network filesystems answer from cached attributes.
+    Large directories are stat-ed in chunks on several threads, so many
+    requests are in flight at once on (networked) storage.
+
+    Args:
+        directory (str): Directory the entries were listed from
+        entries (list): DirEntry objects of files
+        follow_symlinks (bool): Stat the targets of symlinks
+
+    Returns:
+        list: (size, mtime_ns) per entry, None for entries that no longer exist
+
+    Raises:
+        OSError: If the directory cannot be opened
+    """
+    dir_fd = None
+    if linux_statx.is_available():
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+
+    try:
+        if len(entries) < PARALLEL_STAT_THRESHOLD:
+            return _stat_entries(entries, dir_fd, follow_symlinks)
+
+        chunks = [entries[i:i + PARALLEL_STAT_CHUNK] for i in range(0, len(entries), PARALLEL_STAT_CHUNK)]
+        return [
+            stat
+            for chunk_stats in _stat_pool.map(lambda chunk: _stat_entries(chunk, dir_fd, follow_symlinks), chunks)
+            for stat in chunk_stats
+        ]
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+def _is_png(header):
+    """Check the full PNG signature and the IHDR chunk."""
+    return header.startswith(b'\x89PNG\r\n\x1a\n') and b'IHDR' in header[8:]
+
+
+def _is_gif(header):
+    """Check for a GIF87a or GIF89a signature."""
+    return header[:6] in (b'GIF87a', b'GIF89a')
+
+
+def _is_bmp(header):
+    """Check that a BMP header is long enough to be valid."""
+    return len(header) >= 14
+
+
+def _is_webp(header):
+    """Check that a RIFF container holds WEBP data."""
+    return b'WEBP' in header
+
+
+def _signature_ok(header):
+    """Accept a header whose prefix alone identifies the format."""
+    return True
+
+
+# Image signature prefixes mapped to validators for the rest of the header.
+# Prefixes are looked up by length, longest first.
+_IMAGE_SIGNATURES = {
+    b'\x89PNG': _is_png,
+    b'GIF8': _is_gif,
+    b'II\x2A\x00': _signature_ok,  # TIFF, little endian
+    b'MM\x00\x2A': _signature_ok,  # TIFF, big endian
+    b'RIFF': _is_webp,
+    b'\xFF\xD8\xFF': _signature_ok,  # JPEG
+    b'BM': _is_bmp,
+}
+
+
+def _disk_fileno(stream):
+    """
+    Get the file descriptor of a disk-backed stream.
+
+    In-memory streams return None, and so do SpooledTemporaryFile objects:
+    their fileno() would force an in-memory file to roll over to disk, so
+    they are read through the public seek/read path.
+
+    Args:
+        stream: File-like object
+
+    Returns:
+        int: File descriptor or None
+    """
+    if isinstance(stream, tempfile.SpooledTemporaryFile):
+        return None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def read_file_header(file, size=32):
+    """
+    Read the first bytes from the current position without moving it.
+
+    Disk-backed streams are read with a single positional os.pread; other
+    streams are read and seeked back.
+
+    Args:
+        file: File object (e.g. a Werkzeug FileStorage)
+        size (int): Number of bytes to read
+
+    Returns:
+        bytes: Header bytes (may be shorter than size)
+    """
+    position = file.tell()
+    fd = _disk_fileno(getattr(file, 'stream', file))
+    if fd is not None and hasattr(os, 'pread'):
+        return os.pread(fd, size, position)
+
+    header = file.read(size)
+    file.seek(position)  # Reset file position
+    return header
+
+
+def is_json_file(filename):
+    """
+    Check if a file is a JSON file.
+
+    Args:
+        filename (str): Filename to check
+
+    Returns:
+        bool: True if file has a .json extension
+    """
+    return filename.endswith('.json')
+
+
+def build_pagination(page, per_page, total):
+    """
+    Build pagination info, clamping the page into the valid range.
+
+    Args:
+        page (int): Requested page number (1-based)
+        per_page (int): Items per page
+        total (int): Total number of items
+
+    Returns:
+        Pagination: Pagination info; pages is a lazy range of nearby page numbers
+    """
+    total_pages = (total + per_page - 1) // per_page
+
+    # Adjust page if out of range
+    if page < 1:
+        page = 1
+    elif page > total_pages and total_pages > 0:
+        page = total_pages
+
+    return Pagination(
+        page=page,
+        per_page=per_page,
+        total=total,
+        total_pages=total_pages,
+        has_prev=page > 1,
+        has_next=page < total_pages,
+        prev_page=page - 1 if page > 1 else None,
+        next_page=page + 1 if page < total_pages else None,
+        pages=range(max(1, page - 2), min(total_pages + 1, page + 3))
+    )
 
 
 class FileManager:
@@ -51,6 +285,7 @@ class FileManager:
         """
         self.path_manager = path_manager
         self.cache = get_file_cache()
+        self.negative_cache = get_negative_cache()
         
     def get_files_in_directory(self, directory, page=1, per_page=12, filter_func=None, sort_by='modified', reverse=True):
         """
@@ -67,78 +302,60 @@ class FileManager:
         Returns:
             tuple: (files, pagination)
         """
-        # Use a cache key including all parameters
-        cache_key = f"dir_listing:{directory}:{page}:{per_page}:{sort_by}:{reverse}"
-        if filter_func:
-            cache_key += f":{filter_func.__name__}"
-            
-        # Try to get from cache
-        cached_result = self.cache.get(cache_key)
-        if cached_result:
-            logger.debug(f"Cache hit for directory listing: {directory}")
-            return cached_result
-            
+        filter_name = filter_func.__name__ if filter_func else ''
+
+        # The directory mtime changes whenever an entry is added, removed or
+        # renamed, so keying on it makes stale listings miss automatically
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except Exception as e:
+            logger.error(f"Error listing directory {directory}: {str(e)}")
+            return [], build_pagination(page, per_page, 0)
+
+        # Cache the full sorted listing once; every page is sliced from it
+        cache_key = f"dir_sorted:{directory}:{sort_by}:{reverse}:{filter_name}:{dir_mtime}"
+
         with Timer() as timer:
-            all_entries = []
-            
-            try:
-                # Use scandir for better performance
-                with os.scandir(directory) as entries:
-                    for entry in entries:
-                        # Skip directories if not explicitly needed
-                        if not entry.is_file():
-                            continue
-                            
-                        # Apply filter if provided
-                        if filter_func and not filter_func(entry.name):
-                            continue
-                            
-                        # Get file stats more efficiently
-                        stat = entry.stat()
-                        
-                        all_entries.append({
-                            'name': entry.name,
-                            'path': entry.path,
-                            'size': stat.st_size,
-                            'modified': datetime.fromtimestamp(stat.st_mtime)
-                        })
-            except Exception as e:
-                logger.error(f"Error listing directory {directory}: {str(e)}")
-                return [], {'page': page, 'per_page': per_page, 'total': 0, 'total_pages': 0}
-                
-            # Sort entries
-            if sort_by == 'name':
-                all_entries.sort(key=lambda x: x['name'], reverse=reverse)
-            elif sort_by == 'size':
-                all_entries.sort(key=lambda x: x['size'], reverse=reverse)
-            else:  # Default to modified date
-                all_entries.sort(key=lambda x: x['modified'], reverse=reverse)
+            listing = self.cache.get(cache_key)
+            if listing is not None:
+                logger.debug(f"Cache hit for directory listing: {directory}")
+            elif page == 1 and per_page <= TOP_N_LIMIT:
+                # A short first page (e.g. "recent files") only needs the top
+                # entries, so select them without sorting the whole directory
+                top_key = f"dir_top:{directory}:{sort_by}:{reverse}:{filter_name}:{per_page}:{dir_mtime}"
+                listing = self.cache.get(top_key)
+                if listing is None:
+                    listing = self._scan_directory(directory, filter_func, sort_by, reverse, limit=per_page)
+                    if listing is None:
+                        return [], build_pagination(page, per_page, 0)
+
+                    self.cache.set(top_key, listing)
+            else:
+                listing = self._scan_directory(directory, filter_func, sort_by, reverse)
+                if listing is None:
+                    return [], build_pagination(page, per_page, 0)
+
+                self.cache.set(cache_key, listing)
                 
             # Calculate pagination
-            total = len(all_entries)
-            total_pages = (total + per_page - 1) // per_page
-            
-            # Adjust page if out of range
-            if page < 1:
-                page = 1
-            elif page > total_pages and total_pages > 0:
-                page = total_pages
+            order = listing['order']
+            total = len(listing['names'])
+            pagination = build_pagination(page, per_page, total)
+            page = pagination.page
                 
-            # Get page slice
+            # Get page slice and build entry dicts only for it
             start_idx = (page - 1) * per_page
             end_idx = min(start_idx + per_page, total)
-            page_entries = all_entries[start_idx:end_idx]
-            
-            # Create pagination info
-            pagination = {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages,
-                'has_prev': page > 1,
-                'has_next': page < total_pages,
-                'pages': list(range(max(1, page - 2), min(total_pages + 1, page + 3)))
-            }
+            names, paths, sizes, mtimes = listing['names'], listing['paths'], listing['sizes'], listing['mtimes']
+            page_entries = [
+                {
+                    'name': names[i],
+                    'path': paths[i],
+                    'size': sizes[i],
+                    'modified': datetime.fromtimestamp(mtimes[i] / 1e9)
+                }
+                for i in order[start_idx:end_idx]
+            ]
             
         # Log performance for large directories
         if total > 100:
@@ -152,12 +369,121 @@ class FileManager:
                 }
             )
             
-        # Cache the result
-        result = (page_entries, pagination)
-        self.cache.set(cache_key, result)
-        
-        return result
+        return page_entries, pagination
         
+    def _scan_directory(self, directory, filter_func, sort_by, reverse, limit=None):
+        """
+        Scan a directory into parallel lists and compute the sort order.
+
+        Entries are kept as a struct of arrays (names, paths, sizes, mtimes)
+        plus an 'order' list of indices, so no per-file dicts are built.
+        Modification times are integer nanoseconds, which sort exactly and
+        compare faster than floats.
+
+        Args:
+            directory (str): Directory path
+            filter_func (callable): Function to filter files
+            sort_by (str): Field to sort by ('name', 'modified', 'size')
+            reverse (bool): Sort in reverse order
+            limit (int): Only order the first limit entries (all if None)
+
+        Returns:
+            dict: Listing with 'names', 'paths', 'sizes', 'mtimes' and 'order',
+                or None if the directory could not be read
+        """
+        try:
+            # Use scandir for better performance
+            with os.scandir(directory) as entries:
+                # Skip directories if not explicitly needed. Not following
+                # symlinks lets scandir answer from d_type, so symlinks to
+                # files are not listed
+                files = [
+                    entry for entry in entries
+                    if entry.is_file(follow_symlinks=False)
+                    and (filter_func is None or filter_func(entry.name))
+                ]
+
+            stats = stat_files(directory, files)
+        except Exception as e:
+            logger.error(f"Error listing directory {directory}: {str(e)}")
+            return None
+
+        names = []
+        paths = []
+        sizes = []
+        mtimes = []
+        for entry, stat in zip(files, stats):
+            # Entries removed since they were listed have no stat
+            if stat is None:
+                continue
+            names.append(entry.name)
+            paths.append(entry.path)
+            sizes.append(stat[0])
+            mtimes.append(stat[1])
+
+        # Sort indices by the requested field
+        if sort_by == 'name':
+            sort_keys = names
+        elif sort_by == 'size':
+            sort_keys = sizes
+        else:  # Default to modified date
+            sort_keys = mtimes
+        indices = range(len(names))
+        if limit is None:
+            order = sorted(indices, key=sort_keys.__getitem__, reverse=reverse)
+        else:
+            # O(n log limit) selection, same result as sorted(...)[:limit]
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            order = select(limit, indices, key=sort_keys.__getitem__)
+
+        return {
+            'names': names,
+            'paths': paths,
+            'sizes': sizes,
+            'mtimes': mtimes,
+            'order': order
+        }
+
+    def count_files_in_directory(self, directory, filter_func=None, follow_symlinks=False):
+        """
+        Count the files in a directory without stat-ing them.
+
+        Only the entry names and types returned by scandir are used. The count
+        is cached under the directory mtime.
+
+        Args:
+            directory (str): Directory path
+            filter_func (callable): Function to filter files
+            follow_symlinks (bool): Also count symlinks to files
+
+        Returns:
+            int: Number of matching files (0 if the directory cannot be read)
+        """
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Error listing directory {directory}: {str(e)}")
+            return 0
+
+        filter_name = filter_func.__name__ if filter_func else ''
+        cache_key = f"dir_count:{directory}:{filter_name}:{follow_symlinks}:{dir_mtime}"
+        count = self.cache.get(cache_key)
+        if count is not None:
+            return count
+
+        count = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=follow_symlinks) and (filter_func is None or filter_func(entry.name)):
+                        count += 1
+        except OSError as e:
+            logger.error(f"Error listing directory {directory}: {str(e)}")
+            return 0
+
+        self.cache.set(cache_key, count)
+        return count
+
     def get_downloads(self, page=1, per_page=12):
         """
         Get downloaded files with pagination.
@@ -191,7 +517,7 @@ class FileManager:
             self.path_manager.analysis_dir,
             page,
             per_page,
-            filter_func=lambda f: f.endswith('.json')
+            filter_func=is_json_file
         )
         
     def get_uploadable_files(self, page=1, per_page=12):
@@ -230,9 +556,59 @@ class FileManager:
             filter_func=allowed_file
         )
         
+    def get_directory_names(self, directory):
+        """
+        Get the set of entry names in a directory.
+
+        The set is cached under the directory mtime, so repeated lookups cost
+        one stat instead of a stat per probed name.
+
+        Args:
+            directory (str): Directory path
+
+        Returns:
+            frozenset: Names of the directory entries (empty if unreadable)
+        """
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+
+        cache_key = f"dir_names:{directory}:{dir_mtime}"
+        names = self.cache.get(cache_key)
+        if names is None:
+            try:
+                with os.scandir(directory) as entries:
+                    names = frozenset(entry.name for entry in entries)
+            except OSError as e:
+                logger.error(f"Error listing directory {directory}: {str(e)}")
+                return frozenset()
+            self.cache.set(cache_key, names)
+
+        return names
+
+    @staticmethod
+    def _is_inside(path, directory):
+        """
+        Check that a path resolves to a location inside a directory.
+
+        Args:
+            path (str): Path to check
+            directory (str): Directory that must contain the path
+
+        Returns:
+            bool: True if the resolved path is inside the directory
+        """
+        base = os.path.realpath(directory)
+        return os.path.realpath(path).startswith(os.path.join(base, ''))
+
     def find_original_photo(self, photo_name):
         """
         Find the original photo in any of the photo directories.
+
+        The processed, downloads and uploaded directories are checked in that
+        order; within each, the bare name comes first and then the allowed
+        suffixes in _ALLOWED_SUFFIXES order.
         
         Args:
             photo_name (str): Base name of the photo without extension
@@ -243,8 +619,12 @@ class FileManager:
         # Try to get from cache first
         cache_key = f"original_photo:{photo_name}"
         cached_result = self.cache.get(cache_key)
-        if cached_result:
+        if cached_result is not None:
             return cached_result
+
+        # Recently missed photos are answered from the negative cache
+        if self.negative_cache.get(cache_key) is not None:
+            return (None, None)
             
         # Look in each directory with different extensions
         directories = [
@@ -253,21 +633,28 @@ class FileManager:
             self.path_manager.uploaded_dir
         ]
         
-        extensions = [''] + [f'.{ext}' for ext in ALLOWED_EXTENSIONS]
+        # Scan the directories concurrently so a slow mount costs the slowest
+        # single scan rather than the sum; results are still checked in
+        # directory priority order
+        name_sets = list(_scan_pool.map(self.get_directory_names, directories))
         
-        for directory in directories:
-            for ext in extensions:
-                try:
-                    test_path = safe_path_join(directory, photo_name + ext)
-                    if os.path.exists(test_path):
-                        result = (str(test_path), photo_name + ext)
-                        # Cache the result
-                        self.cache.set(cache_key, result)
-                        return result
-                except PathSecurityError:
-                    continue
+        for directory, names in zip(directories, name_sets):
+            # Membership in the scanned names replaces an exists() probe per
+            # candidate; only the match is turned into a path and validated
+            for ext in _ORIGINAL_SUFFIXES:
+                candidate = photo_name + ext
+                if candidate in names:
+                    original_path = os.path.join(directory, candidate)
+                    if not self._is_inside(original_path, directory):
+                        logger.warning(f"Security: original photo outside its directory: {original_path}")
+                        continue
+                    result = (original_path, candidate)
+                    # Cache the result
+                    self.cache.set(cache_key, result)
+                    return result
                     
         # Not found
+        self.negative_cache.set(cache_key, True)
         return (None, None)
         
     def get_metadata_for_file(self, filename, directory):
@@ -286,21 +673,22 @@ class FileManager:
             base_name = os.path.splitext(filename)[0]
             metadata_path = safe_path_join(directory, base_name + '.json')
             
-            # Check if metadata exists
-            if not os.path.exists(metadata_path):
+            # One stat serves as the existence check and the cache key, so a
+            # new or rewritten sidecar (new mtime or inode) is seen at once
+            try:
+                st = os.stat(metadata_path)
+            except FileNotFoundError:
                 return None
-                
-            # Cache key
-            cache_key = f"metadata:{metadata_path}"
+
+            cache_key = f"metadata:{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}"
             
             # Try to get from cache
             cached_metadata = self.cache.get(cache_key)
-            if cached_metadata:
+            if cached_metadata is not None:
                 return cached_metadata
                 
             # Read and parse JSON
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = read_json_file(metadata_path)
                 
             # Cache the result
             self.cache.set(cache_key, metadata)
@@ -310,6 +698,40 @@ class FileManager:
             logger.error(f"Error loading metadata for {filename}: {str(e)}")
             return None
             
+    def get_metadata_batch(self, filenames, directory):
+        """
+        Get metadata for several files at once.
+
+        The directory is listed once (the listing is cached under its mtime)
+        and only files whose sidecar is present are loaded; those are stat-ed
+        and parsed concurrently, so a page of files costs roughly one storage
+        round trip instead of one per file. Cache hits are served the same
+        way as by get_metadata_for_file.
+
+        Args:
+            filenames (list): Names of the files
+            directory (str): Directory containing the metadata
+
+        Returns:
+            dict: Metadata (or None) by filename
+        """
+        names = self.get_directory_names(directory)
+        results = dict.fromkeys(filenames)
+        present = [
+            filename for filename in results
+            if os.path.splitext(filename)[0] + '.json' in names
+        ]
+
+        if len(present) < 2:
+            for filename in present:
+                results[filename] = self.get_metadata_for_file(filename, directory)
+        else:
+            loaded = _metadata_pool.map(
+                lambda name: self.get_metadata_for_file(name, directory), present
+            )
+            results.update(zip(present, loaded))
+        return results
+
     def save_uploaded_file(self, file, validate=True):
         """
         Save an uploaded file to the downloads directory.
@@ -346,7 +768,7 @@ class FileManager:
         file_path = safe_path_join(self.path_manager.downloads_dir, filename)
         
         # Save the file
-        file.save(file_path)
+        file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
         
         logger.info(f"Saved uploaded file: {filename}")
         
@@ -363,39 +785,14 @@ class FileManager:
             bool: True if valid image, False otherwise
         """
         try:
-            # Save the current position
-            current_position = file.tell()
-            
-            # Read enough bytes for validation
-            header = file.read(32)
-            file.seek(current_position)  # Reset file position
+            # Read enough bytes for validation without moving the position
+            header = read_file_header(file, 32)
             
-            # JPEG validation
-            if header.startswith(b'\xFF\xD8\xFF'):
-                return True
-                
-            # PNG validation
-            if header.startswith(b'\x89PNG\r\n\x1a\n') and b'IHDR' in header[8:]:
-                return True
-                
-            # GIF validation
-            if (header.startswith(b'GIF87a') or header.startswith(b'GIF89a')):
-                return True
-                
-            # BMP validation
-            if header.startswith(b'BM') and len(header) >= 14:
-                return True
-                
-            # TIFF validation
-            if (header.startswith(b'II') and header[2:4] == b'\x2A\x00') or \
-               (header.startswith(b'MM') and header[2:4] == b'\x00\x2A'):
-                return True
-                
-            # WEBP validation
-            if header.startswith(b'RIFF') and b'WEBP' in header:
-                return True
-                
-            return False
+            # Dispatch on the signature prefix
+            validator = (_IMAGE_SIGNATURES.get(header[:4])
+                         or _IMAGE_SIGNATURES.get(header[:3])
+                         or _IMAGE_SIGNATURES.get(header[:2]))
+            return bool(validator and validator(header))
         except Exception as e:
             logger.error(f"Error validating image content: {str(e)}")
             return False
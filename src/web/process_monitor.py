@@ -6,21 +6,322 @@ This module provides process monitoring functionality for the web interface.
 
 import os
 import time
-import select
-import fcntl
+import codecs
+import logging
 import signal
+import asyncio
+import tempfile
+import functools
 import subprocess
 import threading
+from src.utils.config import get_config
 from src.utils.logging import get_logger
 from src.web.exceptions import ProcessExecutionError, TimeoutError
 
 # Get logger
 logger = get_logger('web.process_monitor')
 
+# Clock for elapsed times. The coarse monotonic clock is cheaper to read
+# and its millisecond resolution is plenty for a one second tick
+if hasattr(time, 'CLOCK_MONOTONIC_COARSE'):
+    monotonic = functools.partial(time.clock_gettime, time.CLOCK_MONOTONIC_COARSE)
+else:
+    monotonic = time.monotonic
+
+# Maximum number of bytes read from a pipe at once
+READ_SIZE = 65536
+
+# Scripts may report their progress with stdout lines like "PROGRESS: 42"
+PROGRESS_PREFIX = b'PROGRESS:'
+
+# Longest incomplete stdout line kept between reads to find progress lines
+MAX_PARTIAL_LINE = 64
+
+# Maximum reads per wakeup, so one noisy process cannot starve the others
+MAX_READS_PER_WAKEUP = 16
+
+# Bytes of the most recent output kept in memory per stream; older output
+# is spilled to a file in the logs directory, which rotate_logs cleans up
+OUTPUT_TAIL_SIZE = 256 * 1024
+
+# Event loop shared by all monitors; started on first use so that it lives
+# in the process that actually runs the scripts (e.g. a gunicorn worker)
+_loop = None
+_loop_lock = threading.Lock()
+
+# Seconds between progress updates
+TICK_INTERVAL = 1
+
+# A progress change is written to the tracker once it reaches this many
+# percentage points, or after PROGRESS_WRITE_INTERVAL seconds
+PROGRESS_MIN_STEP = 5
+PROGRESS_WRITE_INTERVAL = 5
+
+# Monitors attached to the loop and the handle of the shared progress tick;
+# both are only touched on the loop thread
+_active_monitors = set()
+_tick_handle = None
+
+
+def get_monitor_loop():
+    """
+    Get the event loop that watches the output of monitored processes.
+
+    The loop runs in a single daemon thread and services every monitor, so
+    watching more processes does not add threads.
+
+    Returns:
+        asyncio.AbstractEventLoop: Running event loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name='process-monitor',
+                daemon=True
+            ).start()
+        return _loop
+
+
+# Minimum seconds between two flushes of queued tracker updates
+TRACKER_FLUSH_INTERVAL = 0.25
+
+
+class TrackerWriter:
+    """
+    Applies process tracker updates on a background thread.
+
+    The tracker saves its state to disk on every update, which must not
+    stall the monitor loop. Updates are queued per PID and coalesced the
+    same way the tracker applies them: the latest status wins and details
+    are merged, so a burst of progress updates costs one write.
+    """
+
+    def __init__(self, interval=TRACKER_FLUSH_INTERVAL):
+        """
+        Initialize the writer.
+
+        Args:
+            interval (float): Minimum seconds between two flushes
+        """
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def submit(self, process_tracker, pid, status=None, details=None):
+        """
+        Queue an update for a process.
+
+        Args:
+            process_tracker: Process tracker instance
+            pid (int): Process ID
+            status (str, optional): New process status
+            details (dict, optional): Process details to merge
+
+        Returns:
+            None
+        """
+        with self._lock:
+            pending = self._pending.get(pid)
+            if pending is None:
+                self._pending[pid] = (process_tracker, status, dict(details or {}))
+            else:
+                _, pending_status, pending_details = pending
+                pending_details.update(details or {})
+                self._pending[pid] = (process_tracker, status or pending_status, pending_details)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='tracker-writer', daemon=True)
+                self._thread.start()
+
+        self._wakeup.set()
+
+    def _run(self):
+        """
+        Write queued updates until the process exits.
+
+        Returns:
+            None
+        """
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            with self._lock:
+                pending, self._pending = self._pending, {}
+
+            for pid, (process_tracker, status, details) in pending.items():
+                try:
+                    process_tracker.update_process(pid=pid, status=status, details=details or None)
+                except Exception as e:
+                    logger.error(f"Error updating process {pid} in tracker: {str(e)}")
+
+            time.sleep(self.interval)
+
+
+# Writer shared by all monitors
+tracker_writer = TrackerWriter()
+
+
+def _schedule_tick(loop):
+    """
+    Schedule the shared progress tick unless it is already pending.
+
+    Must be called on the loop thread.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Monitor event loop
+
+    Returns:
+        None
+    """
+    global _tick_handle
+    if _tick_handle is None:
+        _tick_handle = loop.call_later(TICK_INTERVAL, _tick_all, loop)
+
+
+def _tick_all(loop):
+    """
+    Run the progress tick of every attached monitor.
+
+    One timer serves all monitors; it stops rescheduling itself once no
+    monitor is attached.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Monitor event loop
+
+    Returns:
+        None
+    """
+    global _tick_handle
+    _tick_handle = None
+
+    # Ticks may detach monitors, so iterate over a snapshot
+    for monitor in list(_active_monitors):
+        monitor._tick()
+
+    if _active_monitors:
+        _schedule_tick(loop)
+
+
+class OutputBuffer:
+    """
+    Output collected from one pipe of a monitored process.
+
+    Only the last max_size bytes are kept in memory, so the output stored in
+    the process tracker stays small for chatty scripts. Once the buffer grows
+    to twice that size the older part is appended to a spill file in the
+    logs directory, where it is removed by the regular log rotation.
+    """
+
+    def __init__(self, name, max_size=OUTPUT_TAIL_SIZE, spill_dir=None):
+        """
+        Initialize the buffer.
+
+        Args:
+            name (str): Name used for the spill file (e.g. "script_123_stdout")
+            max_size (int): Number of bytes kept in memory
+            spill_dir (str): Directory for the spill file, defaults to the logs directory
+        """
+        self.name = name
+        self.max_size = max_size
+        self.spill_dir = spill_dir
+        self.data = bytearray()
+        self.spilled = 0
+        self.spill_path = None
+        self._spill_file = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def extend(self, chunk):
+        """
+        Append a chunk of output.
+
+        Args:
+            chunk (bytes): Output read from the pipe
+
+        Returns:
+            None
+        """
+        self.data.extend(chunk)
+        if len(self.data) > 2 * self.max_size:
+            self._spill(len(self.data) - self.max_size)
+
+    def decode(self, chunk):
+        """
+        Decode a chunk, keeping multi-byte characters split across chunks intact.
+
+        Args:
+            chunk (bytes): Output read from the pipe
+
+        Returns:
+            str: Decoded text
+        """
+        return self._decoder.decode(chunk)
+
+    def _spill(self, size):
+        """
+        Move the oldest bytes from memory to the spill file.
+
+        Args:
+            size (int): Number of bytes to move
+
+        Returns:
+            None
+        """
+        try:
+            if self._spill_file is None:
+                if self.spill_path is None:
+                    spill_dir = self.spill_dir or get_config().logs_dir
+                    fd, self.spill_path = tempfile.mkstemp(prefix=f"{self.name}_", suffix='.log', dir=spill_dir)
+                    self._spill_file = os.fdopen(fd, 'ab')
+                else:
+                    self._spill_file = open(self.spill_path, 'ab')
+            self._spill_file.write(self.data[:size])
+        except OSError as e:
+            logger.error(f"Error spilling output of {self.name}: {str(e)}")
+
+        del self.data[:size]
+        self.spilled += size
+
+    def close(self):
+        """
+        Close the spill file, if one was opened.
+
+        Returns:
+            None
+        """
+        if self._spill_file is None:
+            return
+        try:
+            self._spill_file.close()
+        except OSError as e:
+            logger.error(f"Error closing spill file of {self.name}: {str(e)}")
+        self._spill_file = None
+
+    def getvalue(self):
+        """
+        Get the output kept in memory as text.
+
+        Returns:
+            str: Output, with a note pointing to the spill file if any
+        """
+        text = self.data.decode('utf-8', errors='replace')
+        if self.spilled:
+            text = f"[{self.spilled} bytes of earlier output saved to {self.spill_path}]\n" + text
+        return text
+
 
 class ProcessMonitor:
     """
     Process Monitor class for tracking and reporting process status.
+
+    Output pipes are watched by the shared monitor event loop; all methods
+    except start_monitoring, stop_monitoring and kill_process run on the
+    loop thread.
     """
     
     def __init__(self, process, process_tracker, pid, script_name):
@@ -37,81 +338,124 @@ class ProcessMonitor:
         self.process_tracker = process_tracker
         self.pid = pid
         self.script_name = script_name
-        self.start_time = time.time()
-        self.stdout_data = b''
-        self.stderr_data = b''
+        # Monotonic, for elapsed times only; the tracker keeps the wall-clock start
+        self.start_time = monotonic()
+        self.stdout_data = OutputBuffer(f"{script_name}_{pid}_stdout")
+        self.stderr_data = OutputBuffer(f"{script_name}_{pid}_stderr")
         self.total_time_estimate = 30  # Estimate time in seconds
-        self.is_monitoring = False
-        self.monitor_thread = None
-        self.lock = threading.RLock()
-    
-    def setup_nonblocking_io(self):
+        self.reported_progress = None
+        self._last_progress = None
+        self._last_progress_time = 0.0
+        self._partial_line = b''
+        # Pipe descriptors, looked up once
+        self._stdout_fd = process.stdout.fileno()
+        self._stderr_fd = process.stderr.fileno()
+        self._monitoring = threading.Event()
+        self.loop = None
+        self._readers = set()
+        self._stopped = threading.Event()
+            
+    @property
+    def is_monitoring(self):
         """
-        Set up non-blocking I/O for process stdout and stderr.
-        
+        Whether the process is being monitored.
+
         Returns:
-            tuple: (stdout_fd, stderr_fd)
+            bool: True between start_monitoring and the end of monitoring
         """
-        with self.lock:
-            stdout_fd = self.process.stdout.fileno()
-            stderr_fd = self.process.stderr.fileno()
-            
-            # Set stdout to non-blocking mode
-            fl = fcntl.fcntl(stdout_fd, fcntl.F_GETFL)
-            fcntl.fcntl(stdout_fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-            
-            # Set stderr to non-blocking mode
-            fl = fcntl.fcntl(stderr_fd, fcntl.F_GETFL)
-            fcntl.fcntl(stderr_fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-            
-            return stdout_fd, stderr_fd
-            
-    def poll_output(self, timeout=0.1):
+        return self._monitoring.is_set()
+
+    def _read_output(self, fd, buffer, is_stderr):
         """
-        Poll process output without blocking.
+        Read available output from a pipe when the loop reports it readable.
+
+        The pipe is read until it would block, so a burst of output is
+        handled in one wakeup.
         
         Args:
-            timeout (float): Select timeout in seconds
+            fd (int): Pipe file descriptor
+            buffer (OutputBuffer): Buffer collecting the pipe output
+            is_stderr (bool): Whether the pipe is stderr
             
         Returns:
-            tuple: (has_new_data, is_alive)
+            None
         """
-        with self.lock:
-            if self.process.poll() is not None:
-                return False, False
-                
-            stdout_fd = self.process.stdout.fileno()
-            stderr_fd = self.process.stderr.fileno()
-            
-            readable, _, _ = select.select([stdout_fd, stderr_fd], [], [], timeout)
-            
-            has_new_data = False
-            
-            if stdout_fd in readable:
-                chunk = self.process.stdout.read()
-                if chunk:
-                    self.stdout_data += chunk
-                    has_new_data = True
-                    
-                    # Log new output
-                    lines = chunk.decode('utf-8', errors='replace').splitlines()
-                    for line in lines:
-                        if line.strip():
-                            logger.info(f"{self.script_name} output: {line}")
-                    
-            if stderr_fd in readable:
-                chunk = self.process.stderr.read()
-                if chunk:
-                    self.stderr_data += chunk
-                    has_new_data = True
-                    
-                    # Log new output
-                    lines = chunk.decode('utf-8', errors='replace').splitlines()
-                    for line in lines:
-                        if line.strip():
-                            logger.warning(f"{self.script_name} error: {line}")
-                    
-            return has_new_data, True
+        # Drain everything that is ready in this wakeup
+        chunks = []
+        for _ in range(MAX_READS_PER_WAKEUP):
+            try:
+                chunk = os.read(fd, READ_SIZE)
+            except BlockingIOError:
+                break
+
+            if not chunk:
+                # EOF: the process closed its end of the pipe
+                self._remove_reader(fd)
+                break
+
+            buffer.extend(chunk)
+            chunks.append(chunk)
+
+        if not chunks:
+            return
+
+        chunk = b''.join(chunks) if len(chunks) > 1 else chunks[0]
+
+        if not is_stderr:
+            self._scan_progress(chunk)
+
+        # Log new output with one record per read, skipping the decode
+        # entirely when the level is disabled
+        level = logging.WARNING if is_stderr else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+
+        text = '\n'.join(line for line in buffer.decode(chunk).splitlines() if line.strip())
+        if text:
+            if is_stderr:
+                logger.warning("%s error:\n%s", self.script_name, text)
+            else:
+                logger.info("%s output:\n%s", self.script_name, text)
+
+    def _scan_progress(self, chunk):
+        """
+        Pick up "PROGRESS: <percent>" lines reported on stdout.
+
+        Args:
+            chunk (bytes): Output read from stdout
+
+        Returns:
+            None
+        """
+        data = self._partial_line + chunk
+        last_newline = data.rfind(b'\n')
+
+        # Keep the unfinished last line; progress lines are short
+        self._partial_line = data[last_newline + 1:][-MAX_PARTIAL_LINE:]
+
+        if last_newline == -1 or PROGRESS_PREFIX not in data:
+            return
+
+        for line in data[:last_newline].splitlines():
+            if line.startswith(PROGRESS_PREFIX):
+                try:
+                    self.reported_progress = max(0, min(100, int(line[len(PROGRESS_PREFIX):].strip())))
+                except ValueError:
+                    pass
+
+    def _remove_reader(self, fd):
+        """
+        Stop watching a pipe.
+
+        Args:
+            fd (int): Pipe file descriptor
+
+        Returns:
+            None
+        """
+        if fd in self._readers:
+            self._readers.discard(fd)
+            self.loop.remove_reader(fd)
             
     def update_progress(self, progress, message=None):
         """
@@ -124,162 +468,138 @@ class ProcessMonitor:
         Returns:
             None
         """
-        with self.lock:
-            elapsed = time.time() - self.start_time
-            
-            details = {
-                "progress": progress,
-                "elapsed_time": elapsed
-            }
+        elapsed = monotonic() - self.start_time
+        
+        details = {
+            "progress": progress,
+            "elapsed_time": elapsed
+        }
+        
+        if message:
+            details["progress_message"] = message
+        else:
+            details["progress_message"] = f"Running {self.script_name}... ({progress}%)"
             
-            if message:
-                details["progress_message"] = message
-            else:
-                details["progress_message"] = f"Running {self.script_name}... ({progress}%)"
-                
-            self.process_tracker.update_process(
-                pid=self.pid,
-                details=details
-            )
+        tracker_writer.submit(
+            self.process_tracker,
+            pid=self.pid,
+            details=details
+        )
     
-    def reset_to_blocking(self):
-        """
-        Reset file descriptors to blocking mode.
-        
-        Returns:
-            None
-        """
-        with self.lock:
-            if not self.process:
-                return
-                
-            try:
-                stdout_fd = self.process.stdout.fileno()
-                stderr_fd = self.process.stderr.fileno()
-                
-                # Reset stdout to blocking mode
-                fl_stdout = fcntl.fcntl(stdout_fd, fcntl.F_GETFL)
-                fcntl.fcntl(stdout_fd, fcntl.F_SETFL, fl_stdout & ~os.O_NONBLOCK)
-                
-                # Reset stderr to blocking mode
-                fl_stderr = fcntl.fcntl(stderr_fd, fcntl.F_GETFL)
-                fcntl.fcntl(stderr_fd, fcntl.F_SETFL, fl_stderr & ~os.O_NONBLOCK)
-            except Exception as e:
-                logger.error(f"Error resetting to blocking mode: {str(e)}")
-                
     def get_remaining_output(self, timeout=1):
         """
         Get any remaining output from the process.
+
+        The process has already exited, so the pipes are drained with
+        non-blocking reads until EOF and then closed. A pipe still held open
+        by a leftover child stops the drain instead of blocking it.
         
         Args:
-            timeout (int): Timeout in seconds
+            timeout (int): Timeout in seconds for reaping the process
             
         Returns:
             tuple: (stdout_text, stderr_text)
         """
-        with self.lock:
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Kill the process if it does not exit in time
+            self._signal_group(signal.SIGKILL)
+            self.process.wait()
+
+        for fd, buffer in ((self._stdout_fd, self.stdout_data), (self._stderr_fd, self.stderr_data)):
             try:
-                # Reset to blocking mode before communicate
-                self.reset_to_blocking()
-                
-                # Get remaining output with timeout
-                remaining_stdout, remaining_stderr = self.process.communicate(timeout=timeout)
-                
-                if remaining_stdout:
-                    self.stdout_data += remaining_stdout
-                    
-                if remaining_stderr:
-                    self.stderr_data += remaining_stderr
-            except subprocess.TimeoutExpired:
-                # Kill the process if communicate times out
-                self.process.kill()
-                remaining_stdout, remaining_stderr = self.process.communicate()
-                
-                if remaining_stdout:
-                    self.stdout_data += remaining_stdout
-                    
-                if remaining_stderr:
-                    self.stderr_data += remaining_stderr
-            except Exception as e:
+                while True:
+                    chunk = os.read(fd, READ_SIZE)
+                    if not chunk:
+                        break
+                    buffer.extend(chunk)
+            except BlockingIOError:
+                pass
+            except OSError as e:
                 logger.error(f"Error getting remaining output: {str(e)}")
-                
-            # Decode stdout and stderr
-            stdout_text = self.stdout_data.decode('utf-8', errors='replace')
-            stderr_text = self.stderr_data.decode('utf-8', errors='replace')
-            
-            return stdout_text, stderr_text
+
+        # Close the pipes and spill files now that they are drained
+        self.process.stdout.close()
+        self.process.stderr.close()
+        self.stdout_data.close()
+        self.stderr_data.close()
             
-    def monitor(self):
-        """
-        Monitor the process and update its status.
-        
-        This method should be called in a separate thread.
+        # Decode stdout and stderr once
+        stdout_text = self.stdout_data.getvalue()
+        stderr_text = self.stderr_data.getvalue()
         
+        return stdout_text, stderr_text
+
+    def _attach(self):
+        """
+        Register the process pipes with the loop and join the progress tick.
+
+        Returns:
+            None
+        """
+        for fd, buffer, is_stderr in ((self._stdout_fd, self.stdout_data, False),
+                                      (self._stderr_fd, self.stderr_data, True)):
+            os.set_blocking(fd, False)
+            self.loop.add_reader(fd, self._read_output, fd, buffer, is_stderr)
+            self._readers.add(fd)
+
+        _active_monitors.add(self)
+        _schedule_tick(self.loop)
+
+    def _detach(self):
+        """
+        Unregister the process pipes, close the spill files and leave the progress tick.
+
+        Returns:
+            None
+        """
+        for fd in list(self._readers):
+            self._remove_reader(fd)
+        self.stdout_data.close()
+        self.stderr_data.close()
+
+        _active_monitors.discard(self)
+
+        self._monitoring.clear()
+        self._stopped.set()
+
+    def _tick(self):
+        """
+        Update progress and finish when the process has exited.
+
+        Called by the shared progress tick.
+
         Returns:
             None
         """
-        self.is_monitoring = True
-        
         try:
-            # Set up non-blocking I/O
-            self.setup_nonblocking_io()
-            
-            # Monitor the process
-            while self.process.poll() is None and self.is_monitoring:
-                # Poll for new output
-                _, _ = self.poll_output()
-                
-                # Calculate progress based on elapsed time
-                elapsed = time.time() - self.start_time
-                progress = min(95, int(elapsed / self.total_time_estimate * 100))
-                
-                # Update progress
-                self.update_progress(progress)
-                
-                # Sleep for a short time
-                time.sleep(1)
+            if self.process.poll() is None:
+                if self.reported_progress is not None:
+                    # Progress reported by the script itself
+                    progress = self.reported_progress
+                else:
+                    # Estimate progress based on elapsed time
+                    elapsed = monotonic() - self.start_time
+                    progress = min(95, int(elapsed / self.total_time_estimate * 100))
                 
-            # Process has completed or monitoring stopped
-            if not self.is_monitoring:
-                logger.info(f"Monitoring stopped for process {self.script_name} (PID: {self.pid})")
+                # Only write to the tracker when the progress changed, and
+                # coalesce small steps; the final status is always written
+                if progress != self._last_progress:
+                    now = monotonic()
+                    if (self._last_progress is None
+                            or abs(progress - self._last_progress) >= PROGRESS_MIN_STEP
+                            or now - self._last_progress_time >= PROGRESS_WRITE_INTERVAL):
+                        self._last_progress = progress
+                        self._last_progress_time = now
+                        self.update_progress(progress)
                 return
-                
-            # Get remaining output
-            stdout_text, stderr_text = self.get_remaining_output()
-            
-            # Check if process completed successfully
-            if self.process.returncode == 0:
-                # Update process status to finished
-                self.process_tracker.update_process(
-                    pid=self.pid,
-                    status="finished",
-                    details={
-                        "progress": 100,
-                        "progress_message": f"{self.script_name} completed successfully",
-                        "stdout": stdout_text,
-                        "stderr": stderr_text,
-                        "elapsed_time": time.time() - self.start_time
-                    }
-                )
-                logger.info(f"Process {self.script_name} (PID: {self.pid}) completed successfully")
-            else:
-                # Update process status to error
-                self.process_tracker.update_process(
-                    pid=self.pid,
-                    status="error",
-                    details={
-                        "progress": 100,
-                        "progress_message": f"Error in {self.script_name}: Return code {self.process.returncode}",
-                        "stdout": stdout_text,
-                        "stderr": stderr_text,
-                        "return_code": self.process.returncode,
-                        "elapsed_time": time.time() - self.start_time
-                    }
-                )
-                logger.error(f"Process {self.script_name} (PID: {self.pid}) failed with return code {self.process.returncode}")
+
+            self._finish()
         except Exception as e:
             # Update process status to error
-            self.process_tracker.update_process(
+            tracker_writer.submit(
+                self.process_tracker,
                 pid=self.pid,
                 status="error",
                 details={
@@ -289,12 +609,60 @@ class ProcessMonitor:
                 }
             )
             logger.error(f"Error monitoring process {self.script_name} (PID: {self.pid}): {str(e)}")
-        finally:
-            self.is_monitoring = False
+            self._detach()
+
+    def _finish(self):
+        """
+        Collect the remaining output of an exited process and record its status.
+
+        Returns:
+            None
+        """
+        # Stop watching the pipes; get_remaining_output reads what is left
+        for fd in list(self._readers):
+            self._remove_reader(fd)
+
+        # Get remaining output
+        stdout_text, stderr_text = self.get_remaining_output()
+        
+        # Check if process completed successfully
+        if self.process.returncode == 0:
+            # Update process status to finished
+            tracker_writer.submit(
+                self.process_tracker,
+                pid=self.pid,
+                status="finished",
+                details={
+                    "progress": 100,
+                    "progress_message": f"{self.script_name} completed successfully",
+                    "stdout": stdout_text,
+                    "stderr": stderr_text,
+                    "elapsed_time": monotonic() - self.start_time
+                }
+            )
+            logger.info(f"Process {self.script_name} (PID: {self.pid}) completed successfully")
+        else:
+            # Update process status to error
+            tracker_writer.submit(
+                self.process_tracker,
+                pid=self.pid,
+                status="error",
+                details={
+                    "progress": 100,
+                    "progress_message": f"Error in {self.script_name}: Return code {self.process.returncode}",
+                    "stdout": stdout_text,
+                    "stderr": stderr_text,
+                    "return_code": self.process.returncode,
+                    "elapsed_time": monotonic() - self.start_time
+                }
+            )
+            logger.error(f"Process {self.script_name} (PID: {self.pid}) failed with return code {self.process.returncode}")
+
+        self._detach()
             
     def start_monitoring(self):
         """
-        Start monitoring the process in a separate thread.
+        Start monitoring the process on the shared monitor loop.
         
         Returns:
             ProcessMonitor: Self for chaining
@@ -303,12 +671,10 @@ class ProcessMonitor:
             logger.warning(f"Process {self.script_name} (PID: {self.pid}) is already being monitored")
             return self
             
-        # Create and start the monitor thread
-        self.monitor_thread = threading.Thread(
-            target=self.monitor,
-            daemon=True
-        )
-        self.monitor_thread.start()
+        self._monitoring.set()
+        self._stopped.clear()
+        self.loop = get_monitor_loop()
+        self.loop.call_soon_threadsafe(self._attach)
         
         logger.info(f"Started monitoring process {self.script_name} (PID: {self.pid})")
         
@@ -324,14 +690,29 @@ class ProcessMonitor:
         if not self.is_monitoring:
             return
             
-        self.is_monitoring = False
-        
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            # Wait for the monitor thread to complete
-            self.monitor_thread.join(timeout=2)
+        self.loop.call_soon_threadsafe(self._detach)
+
+        # Wait for the loop to release the pipes
+        self._stopped.wait(timeout=2)
             
         logger.info(f"Stopped monitoring process {self.script_name} (PID: {self.pid})")
         
+    def _signal_group(self, sig):
+        """
+        Send a signal to the process group of the monitored process.
+
+        Args:
+            sig (int): Signal number
+
+        Returns:
+            None
+        """
+        try:
+            os.killpg(self.pid, sig)
+        except ProcessLookupError:
+            # The group is already gone
+            pass
+
     def kill_process(self):
         """
         Kill the process.
@@ -348,32 +729,43 @@ class ProcessMonitor:
             
             # Check if process is still running
             if self.process.poll() is None:
+                # The script runs in its own process group (see run_process),
+                # so signal the group to take down its children as well.
                 # Try to terminate gracefully first
-                self.process.terminate()
+                self._signal_group(signal.SIGTERM)
                 
                 # Wait for a short time
                 try:
                     self.process.wait(timeout=3)
                 except subprocess.TimeoutExpired:
                     # Force kill if terminate doesn't work
-                    self.process.kill()
+                    self._signal_group(signal.SIGKILL)
                     self.process.wait()
                     
                 logger.info(f"Killed process {self.script_name} (PID: {self.pid})")
+
+                # Read what is left in the pipes and close them
+                stdout_text, stderr_text = self.get_remaining_output()
                 
                 # Update process status to killed
-                self.process_tracker.update_process(
+                tracker_writer.submit(
+                    self.process_tracker,
                     pid=self.pid,
                     status="killed",
                     details={
                         "progress": 100,
                         "progress_message": f"{self.script_name} was killed",
-                        "elapsed_time": time.time() - self.start_time
+                        "stdout": stdout_text,
+                        "stderr": stderr_text,
+                        "elapsed_time": monotonic() - self.start_time
                     }
                 )
                 
                 return True
             else:
+                # Monitoring may have stopped before the exit was collected
+                if not self.process.stdout.closed:
+                    self.get_remaining_output()
                 logger.info(f"Process {self.script_name} (PID: {self.pid}) already completed")
                 return False
         except Exception as e:
@@ -405,7 +797,13 @@ def run_process(command, process_tracker, script_name, shell=False):
             stderr=subprocess.PIPE,
             shell=shell,
             universal_newlines=False,
-            bufsize=1
+            # Run in a new session (and process group) so the whole tree of
+            # the script can be signalled with killpg
+            start_new_session=True,
+            # Line buffering (bufsize=1) only applies in text mode; for binary
+            # pipes use an explicit block buffer. The monitor reads the pipes
+            # with os.read(fd, READ_SIZE) and never goes through these buffers
+            bufsize=READ_SIZE
         )
         
         # Add process to tracker
@@ -8,20 +8,43 @@ import os
 import json
 import signal
 import time
+import functools
 from pathlib import Path
-from flask import redirect, url_for, flash
+from flask import redirect, url_for, flash, current_app, request
 from werkzeug.utils import secure_filename
 
 from src.utils.logging import get_logger
 from src.web.exceptions import PathSecurityError, TimeoutError
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
 # Get logger
 logger = get_logger('web.utils')
 
 
+@functools.lru_cache(maxsize=32)
+def _resolved_base(base_dir):
+    """
+    Resolve a base directory once and cache it.
+
+    Args:
+        base_dir (str): Base directory path
+
+    Returns:
+        str: Resolved directory path with a trailing separator
+    """
+    return os.path.join(str(Path(base_dir).resolve()), '')
+
+
 def safe_path_join(base_dir, filename):
     """
     Safely join base directory and filename, ensuring the result stays within the base directory.
+
+    The base directory is resolved once per process; the joined path is only
+    normalized lexically, so no filesystem access happens per call.
     
     Args:
         base_dir (str): Base directory path
@@ -36,16 +59,41 @@ def safe_path_join(base_dir, filename):
     # Sanitize filename
     safe_filename = secure_filename(filename)
     
-    # Create absolute paths
-    base_path = Path(base_dir).resolve()
-    full_path = base_path.joinpath(safe_filename).resolve()
+    # Join to the resolved base and normalize without touching the filesystem
+    base_path = _resolved_base(str(base_dir))
+    full_path = os.path.normpath(os.path.join(base_path, safe_filename))
     
     # Check if the path is within the base directory
-    if not str(full_path).startswith(str(base_path)):
+    if not full_path.startswith(base_path):
         logger.warning(f"Security: Attempted path traversal: {filename} -> {full_path}")
         raise PathSecurityError(f"Invalid path: {filename}")
         
-    return full_path
+    return Path(full_path)
+
+
+def read_json_file(path):
+    """
+    Read and parse a JSON file.
+
+    The file is read as bytes and parsed with orjson when it is installed,
+    which skips the text decoding layer; otherwise the standard json module
+    is used.
+
+    Args:
+        path (str or Path): Path to the JSON file
+
+    Returns:
+        Any: Parsed JSON data
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def handle_api_error(error, default_message="An error occurred", redirect_route='main.index'):
@@ -63,7 +111,29 @@ def handle_api_error(error, default_message="An error occurred", redirect_route=
     error_message = str(error)
     logger.error(f"{default_message}: {error_message}")
     flash(f"{default_message}: {error_message}", "danger")
-    return redirect(url_for(redirect_route))
+    return redirect(_cached_url_for(redirect_route))
+
+
+def _cached_url_for(endpoint):
+    """
+    Build the URL of an endpoint without arguments, caching the result.
+
+    The URL only depends on the endpoint, the application's URL map and the
+    script root it is mounted under. The cache is stored on the application,
+    so it goes away with it, and keyed on the script root and endpoint.
+
+    Args:
+        endpoint (str): Endpoint name
+
+    Returns:
+        str: URL of the endpoint
+    """
+    urls = current_app.extensions.setdefault('redirect_urls', {})
+    key = (request.script_root, endpoint)
+    url = urls.get(key)
+    if url is None:
+        url = urls[key] = url_for(endpoint)
+    return url
 
 
 def log_with_context(logger_func, message, context=None):
@@ -86,6 +156,9 @@ def log_with_context(logger_func, message, context=None):
 class Timeout:
     """
     Context manager for timing out operations.
+
+    Uses SIGALRM, so it only works in the main thread of the main
+    interpreter; in any other thread signal.signal raises ValueError.
     
     Usage:
         with Timeout(seconds=5):
@@ -109,6 +182,8 @@ class Timeout:
 def with_timeout(seconds):
     """
     Decorator to apply timeout to a function.
+
+    Main thread only, like Timeout.
     
     Args:
         seconds (int): Timeout in seconds
@@ -117,6 +192,7 @@ def with_timeout(seconds):
         function: Decorated function
     """
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             with Timeout(seconds=seconds):
                 return func(*args, **kwargs)
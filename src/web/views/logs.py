@@ -6,12 +6,19 @@ This module provides the logs views for the web interface.
 
 import os
 import re
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, send_file
+import mmap
+import time
+import functools
+from collections import deque
+from urllib.parse import quote
+from flask import Blueprint, Response, render_template, request, redirect, url_for, flash, jsonify, current_app, send_file
 from datetime import datetime
 
 from src.utils.config import get_config
 from src.utils.logging import get_logger, rotate_logs
 from src.utils.paths import get_path_manager
+from src.web.utils import safe_path_join
+from src.web.exceptions import PathSecurityError
 
 # Get logger
 logger = get_logger('web.logs')
@@ -19,24 +26,48 @@ logger = get_logger('web.logs')
 # Create blueprint
 bp = Blueprint('logs', __name__, url_prefix='/logs')
 
-@bp.route('/')
-def index():
-    """Render the logs page."""
-    config = get_config()
-    logs_dir = config.logs_dir
+# Date embedded in rotated log file names
+_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
 
-    # Get all log files
-    log_files = []
-    for filename in os.listdir(logs_dir):
-        if filename.endswith('.log'):
-            file_path = os.path.join(logs_dir, filename)
+# Log line: 2023-04-10 14:25:33,123 - module - LEVEL - Message
+_LOG_LINE_RE = re.compile(
+    r'^\s*(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{1,6})\s* - '
+    r'\s*(?P<module>.*?)\s* - \s*(?P<level>.*?)\s* - (?P<message>.*)$'
+)
+
+# Appending to a log does not change the directory mtime, so listings are
+# also refreshed after this many seconds to pick up new sizes
+LOG_LISTING_TTL = 10
 
+# Only the end of the selected log is shown; the full file can be downloaded
+LOG_TAIL_BYTES = 256 * 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _list_log_files(logs_dir, dir_mtime_ns, ttl_bucket):
+    """
+    List the log files in a directory, newest first.
+
+    The arguments after logs_dir only serve as cache key: a new directory
+    mtime or TTL bucket forces a fresh scan.
+
+    Args:
+        logs_dir (str): Logs directory
+        dir_mtime_ns (int): Directory modification time in nanoseconds
+        ttl_bucket (int): Current TTL period
+
+    Returns:
+        tuple: Log file info dicts
+    """
+    log_files = []
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
             # Skip symbolic links
-            if os.path.islink(file_path):
+            if not entry.name.endswith('.log') or entry.is_symlink():
                 continue
 
             # Extract date from filename
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
+            date_match = _DATE_RE.search(entry.name)
             log_date = None
             if date_match:
                 try:
@@ -44,81 +75,143 @@ def index():
                 except ValueError:
                     pass
 
+            st = entry.stat(follow_symlinks=False)
             log_files.append({
-                'name': filename,
-                'path': file_path,
-                'size': os.path.getsize(file_path),
-                'modified': datetime.fromtimestamp(os.path.getmtime(file_path)),
+                'name': entry.name,
+                'path': entry.path,
+                'size': st.st_size,
+                'modified': datetime.fromtimestamp(st.st_mtime),
                 'date': log_date
             })
 
     # Sort by date (newest first)
     log_files.sort(key=lambda x: x['modified'], reverse=True)
+    return tuple(log_files)
+
+
+def _parse_log_line(line):
+    """
+    Parse a log line into its parts.
+
+    The timestamp is built from the regex groups directly, which is much
+    cheaper than datetime.strptime.
+
+    Args:
+        line (str): Log line
+
+    Returns:
+        dict: Log entry; lines without the separators are returned as raw messages
+    """
+    match = _LOG_LINE_RE.match(line)
+    if match is None:
+        # Keep the parts of lines whose timestamp cannot be parsed, so the
+        # level filter and colouring still work for them
+        parts = line.split(' - ', 3)
+        if len(parts) >= 4:
+            _, module, level, message = parts
+            return {
+                'timestamp': None,
+                'module': module.strip(),
+                'level': level.strip(),
+                'message': message.strip()
+            }
+
+        return {
+            'timestamp': None,
+            'module': None,
+            'level': None,
+            'message': line
+        }
+
+    year, month, day, hour, minute, second, fraction = match.groups()[:7]
+    try:
+        timestamp = datetime(int(year), int(month), int(day), int(hour), int(minute),
+                             int(second), int(fraction.ljust(6, '0')))
+    except ValueError:
+        timestamp = None
+
+    return {
+        'timestamp': timestamp,
+        'module': match.group('module'),
+        'level': match.group('level'),
+        'message': match.group('message').strip()
+    }
+
+
+def _read_log_entries(path, tail_bytes=LOG_TAIL_BYTES):
+    """
+    Parse the entries at the end of a log file, newest first.
+
+    The file is memory-mapped and the tail is walked line by line, so only
+    the pages of the tail are read and no copy of the text is built.
+
+    Args:
+        path (str): Log file path
+        tail_bytes (int): Maximum number of bytes to read
+
+    Returns:
+        tuple: (entries, truncated) where truncated is True if earlier lines were skipped
+    """
+    entries = deque()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # Empty files cannot be mapped
+            return [], False
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = max(0, size - tail_bytes)
+            if start:
+                # Drop the partial first line
+                newline = mm.find(b'\n', start)
+                start = size if newline == -1 else newline + 1
+
+            mm.seek(start)
+            for raw_line in iter(mm.readline, b''):
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                if line.strip():
+                    entries.appendleft(_parse_log_line(line))
+
+    return list(entries), start > 0
+
+
+@bp.route('/')
+def index():
+    """Render the logs page."""
+    config = get_config()
+    logs_dir = config.logs_dir
+
+    # Get all log files
+    log_files = _list_log_files(
+        str(logs_dir),
+        os.stat(logs_dir).st_mtime_ns,
+        int(time.monotonic() // LOG_LISTING_TTL)
+    )
 
     # Get selected log file
     selected_log = request.args.get('file')
     if selected_log and selected_log in [log['name'] for log in log_files]:
         selected_path = os.path.join(logs_dir, selected_log)
 
-        # Read log file content
+        # Parse the end of the log file, newest entries first
         try:
-            with open(selected_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Parse log entries
-            log_entries = []
-            for line in content.split('\n'):
-                if not line.strip():
-                    continue
-
-                # Try to parse log entry
-                try:
-                    # Format: 2023-04-10 14:25:33,123 - module - LEVEL - Message
-                    parts = line.split(' - ', 3)
-                    if len(parts) >= 4:
-                        timestamp_str, module, level, message = parts
-                        try:
-                            timestamp = datetime.strptime(timestamp_str.strip(), '%Y-%m-%d %H:%M:%S,%f')
-                        except ValueError:
-                            timestamp = None
-
-                        log_entries.append({
-                            'timestamp': timestamp,
-                            'module': module.strip(),
-                            'level': level.strip(),
-                            'message': message.strip()
-                        })
-                    else:
-                        # If can't parse, add as raw message
-                        log_entries.append({
-                            'timestamp': None,
-                            'module': None,
-                            'level': None,
-                            'message': line
-                        })
-                except Exception:
-                    # If any error, add as raw message
-                    log_entries.append({
-                        'timestamp': None,
-                        'module': None,
-                        'level': None,
-                        'message': line
-                    })
-
-            # Reverse the order of log entries to show newest first
-            log_entries.reverse()
+            log_entries, log_truncated = _read_log_entries(selected_path)
         except Exception as e:
             flash(f"Error reading log file: {str(e)}", "danger")
             logger.error(f"Error reading log file {selected_log}: {str(e)}")
             log_entries = []
+            log_truncated = False
     else:
         selected_log = None
         log_entries = []
+        log_truncated = False
 
     return render_template('logs/index.html',
                           log_files=log_files,
                           selected_log=selected_log,
-                          log_entries=log_entries)
+                          log_entries=log_entries,
+                          log_truncated=log_truncated,
+                          log_tail_kb=LOG_TAIL_BYTES // 1024)
 
 @bp.route('/download/<path:filename>')
 def download_log(filename):
@@ -126,8 +219,21 @@ def download_log(filename):
     config = get_config()
     logs_dir = config.logs_dir
 
-    file_path = os.path.join(logs_dir, filename)
-    if os.path.exists(file_path) and filename.endswith('.log'):
+    try:
+        file_path = safe_path_join(logs_dir, filename)
+    except PathSecurityError:
+        file_path = None
+
+    if file_path is not None and file_path.name.endswith('.log') and file_path.is_file():
+        accel_prefix = current_app.config.get('LOG_ACCEL_REDIRECT_PREFIX')
+        if accel_prefix:
+            # Let nginx send the file from its internal location
+            response = Response(mimetype='text/plain')
+            response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(file_path.name)
+            response.headers['Content-Disposition'] = f'attachment; filename="{file_path.name}"'
+            return response
+
+        # Under gunicorn send_file goes through wsgi.file_wrapper, which uses sendfile()
         return send_file(file_path, as_attachment=True)
     else:
         flash(f"Log file not found: {filename}", "danger")
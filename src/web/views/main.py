@@ -5,21 +5,27 @@ This module provides the main views for the web interface.
 """
 
 import os
+import sys
+import atexit
 import json
 import time
+import heapq
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
 from flask_wtf.csrf import CSRFProtect
-from datetime import datetime
 
 from src.utils.config import get_config
 from src.utils.logging import get_logger
 from src.utils.paths import get_path_manager
 from src.utils.registry import get_registry
 from src.utils.process_tracker import get_process_tracker
-from src.web.views.photos import allowed_file
+from src.utils.timestamps import now_iso
 from src.web.utils import handle_api_error, log_with_context, Timer
 from src.web.process_monitor import run_process
-from src.web.file_manager import FileManager
+from src.web.file_manager import FileManager, allowed_file
+from src.web.views.photos import clear_scan_cache
 from src.web.exceptions import ProcessExecutionError
 
 # Get logger
@@ -28,53 +34,80 @@ logger = get_logger('web.main')
 # Create blueprint
 bp = Blueprint('main', __name__)
 
+# Resolve the path manager once; its directories do not change at runtime
+_path_manager = get_path_manager()
+
 # Initialize file manager
-file_manager = FileManager(get_path_manager())
+file_manager = FileManager(_path_manager)
+
+# Pool for the independent directory scans of the dashboard and status API
+_io_pool = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4), thread_name_prefix='dashboard-io')
+
+# Status API data, refreshed in the background while clients poll
+STATUS_REFRESH_INTERVAL = 3  # seconds
+STATUS_IDLE_TIMEOUT = 60  # seconds without a status request before the refresher stops
+_latest_status = None
+_status_last_request = 0.0
+_status_refresher = None
+_status_lock = threading.Lock()
+_status_stop = threading.Event()
+atexit.register(_status_stop.set)
+
+# Last dashboard template context: (computed at, context). The rendered page
+# is not cached because it carries per-session CSRF tokens and flashes.
+_dashboard_context = None
+_dashboard_lock = threading.Lock()
+
+
+def _is_analysis_file(filename):
+    """Check if a file is an analysis result."""
+    return filename.endswith('.json')
+
+
+def clear_dashboard_cache():
+    """
+    Drop the cached dashboard context.
+
+    Returns:
+        None
+    """
+    global _dashboard_context
+    with _dashboard_lock:
+        _dashboard_context = None
 
 @bp.route('/')
 def index():
     """Render the dashboard page with optimized file operations."""
+    global _dashboard_context
+
+    # Burst refreshes within the listing TTL reuse the last computed context
+    with _dashboard_lock:
+        cached = _dashboard_context
+    if cached is not None and time.monotonic() - cached[0] < get_config().file.listing_cache_ttl:
+        return render_template('main/index.html', **cached[1])
+
+    computed_at = time.monotonic()
     with Timer() as timer:
-        # Get path manager and registry
-        path_manager = get_path_manager()
-        registry = get_registry()
+        # Get path manager
+        path_manager = _path_manager
         
         try:
-            # Use optimized file operations through the file manager
-            downloads_files, _ = file_manager.get_files_in_directory(
-                path_manager.downloads_dir, 
-                page=1, 
-                per_page=1000,  # Get all files for counting
-                filter_func=allowed_file
+            # The directory scans are independent, so run them concurrently;
+            # only the counts are shown, so count names without stat-ing files
+            downloads_future = _io_pool.submit(
+                file_manager.count_files_in_directory, path_manager.downloads_dir, allowed_file
             )
-            downloads_count = len(downloads_files)
-            
-            analysis_files, _ = file_manager.get_files_in_directory(
-                path_manager.analysis_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: f.endswith('.json')
+            analysis_future = _io_pool.submit(
+                file_manager.count_files_in_directory, path_manager.analysis_dir, _is_analysis_file
             )
-            analysis_count = len(analysis_files)
-            
-            upload_files, _ = file_manager.get_files_in_directory(
-                path_manager.upload_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: f != 'metadata' and allowed_file(f)
+            upload_future = _io_pool.submit(
+                file_manager.count_files_in_directory, path_manager.upload_dir, allowed_file
             )
-            upload_count = len(upload_files)
             
-            uploaded_files, _ = file_manager.get_files_in_directory(
-                path_manager.uploaded_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: not f.endswith('.json') and not f.endswith('.yml') and allowed_file(f)
-            )
-            uploaded_count = len(uploaded_files)
-            
-            # Get processed files for recent activity (limited to 5)
-            processed_files, _ = file_manager.get_files_in_directory(
+            # Get processed and recently uploaded files for recent activity
+            # (limited to 5); the uploaded listing also yields uploaded_count
+            processed_future = _io_pool.submit(
+                file_manager.get_files_in_directory,
                 path_manager.processed_dir,
                 page=1,
                 per_page=5,
@@ -82,24 +115,8 @@ def index():
                 sort_by='modified',
                 reverse=True
             )
-            
-            # Create recent activity list
-            recent_activity = []
-            
-            # Add processed files to recent activity
-            for file_info in processed_files:
-                recent_activity.append({
-                    'type': 'processed',
-                    'filename': file_info['name'],
-                    'timestamp': file_info['modified'].isoformat(),
-                    'info': {
-                        'path': file_info['path'],
-                        'size': file_info['size']
-                    }
-                })
-            
-            # Get recently uploaded files (limited to 5)
-            uploaded_recent, _ = file_manager.get_files_in_directory(
+            uploaded_recent_future = _io_pool.submit(
+                file_manager.get_files_in_directory,
                 path_manager.uploaded_dir,
                 page=1,
                 per_page=5,
@@ -108,31 +125,48 @@ def index():
                 reverse=True
             )
             
-            # Add uploaded files to recent activity
-            for file_info in uploaded_recent:
-                # Get metadata if available using file manager
-                metadata = file_manager.get_metadata_for_file(
-                    file_info['name'],
-                    path_manager.uploaded_dir
-                )
+            downloads_count = downloads_future.result()
+            analysis_count = analysis_future.result()
+            upload_count = upload_future.result()
+            processed_files, _ = processed_future.result()
+            uploaded_recent, uploaded_pagination = uploaded_recent_future.result()
+            uploaded_count = uploaded_pagination.total
+            
+            # Both listings are sorted newest first, so merging them keeps the
+            # order; only the survivors are formatted into activity entries
+            recent = list(islice(heapq.merge(
+                (('processed', file_info) for file_info in processed_files),
+                (('uploaded', file_info) for file_info in uploaded_recent),
+                key=lambda item: item[1]['modified'],
+                reverse=True
+            ), 10))
+            
+            # Load metadata for all recent uploads in one batch
+            uploaded_metadata = file_manager.get_metadata_batch(
+                (file_info['name'] for kind, file_info in recent if kind == 'uploaded'),
+                path_manager.uploaded_dir
+            )
+            
+            # Create recent activity list
+            recent_activity = []
+            for kind, file_info in recent:
+                info = {
+                    'path': file_info['path'],
+                    'size': file_info['size']
+                }
+                if kind == 'uploaded':
+                    info['metadata'] = uploaded_metadata.get(file_info['name'])
                 
                 recent_activity.append({
-                    'type': 'uploaded',
+                    'type': kind,
                     'filename': file_info['name'],
                     'timestamp': file_info['modified'].isoformat(),
-                    'info': {
-                        'path': file_info['path'],
-                        'size': file_info['size'],
-                        'metadata': metadata
-                    }
+                    'info': info
                 })
             
-            # Sort and limit recent activity
-            recent_activity.sort(key=lambda x: x['timestamp'] if x['timestamp'] else '', reverse=True)
-            recent_activity = recent_activity[:10]
-            
             processed_count = len(processed_files)
             uploaded_files_count = len(uploaded_recent)
+            failed = False
             
         except Exception as e:
             logger.error(f"Error getting file statistics: {str(e)}")
@@ -145,6 +179,7 @@ def index():
             processed_count = 0
             uploaded_files_count = 0
             recent_activity = []
+            failed = True
     
     # Log performance for slow operations
     if timer.elapsed > 1.0:
@@ -158,14 +193,22 @@ def index():
             }
         )
         
-    return render_template('main/index.html',
-                          downloads_count=downloads_count,
-                          analysis_count=analysis_count,
-                          upload_count=upload_count,
-                          uploaded_count=uploaded_count,
-                          processed_count=processed_count,
-                          uploaded_files_count=uploaded_files_count,
-                          recent_activity=recent_activity)
+    context = {
+        'downloads_count': downloads_count,
+        'analysis_count': analysis_count,
+        'upload_count': upload_count,
+        'uploaded_count': uploaded_count,
+        'processed_count': processed_count,
+        'uploaded_files_count': uploaded_files_count,
+        'recent_activity': recent_activity
+    }
+
+    # Errors are not cached, so the next refresh retries
+    if not failed:
+        with _dashboard_lock:
+            _dashboard_context = (computed_at, context)
+
+    return render_template('main/index.html', **context)
 
 @bp.route('/run/<script>', methods=['POST'])
 def run_script(script):
@@ -202,11 +245,16 @@ def run_script(script):
         # Get the module name
         module = valid_scripts[script]
         
-        # Prepare the command
-        command = ['python', '-m', module]
+        # Prepare the command; run the scripts with the web app's own
+        # interpreter instead of whatever 'python' resolves to on PATH
+        command = [sys.executable, '-m', module]
         
         # Run the process with the improved process monitor
         process, monitor = run_process(command, process_tracker, script)
+
+        # The script is about to change the photo directories
+        clear_dashboard_cache()
+        clear_scan_cache()
         
         # Log the process start
         log_with_context(
@@ -229,81 +277,130 @@ def run_script(script):
     except Exception as e:
         return handle_api_error(e, f"Unexpected error running {friendly_name}", 'main.index')
 
+def _compute_status():
+    """
+    Collect the system status shown by the status API.
+
+    Returns:
+        dict: Status data
+    """
+    with Timer() as timer:
+        # Get path manager and registry
+        path_manager = _path_manager
+        registry = get_registry()
+        
+        # Count files without stat-ing them, scanning the directories concurrently
+        count_futures = [
+            _io_pool.submit(file_manager.count_files_in_directory, directory, filter_func)
+            for directory, filter_func in (
+                (path_manager.downloads_dir, allowed_file),
+                (path_manager.analysis_dir, _is_analysis_file),
+                (path_manager.upload_dir, allowed_file),
+                (path_manager.uploaded_dir, allowed_file)
+            )
+        ]
+        downloads_count, analysis_count, upload_count, uploaded_count = (
+            future.result() for future in count_futures
+        )
+        
+        # Get registry statistics
+        processed_files_list = registry.get_processed_files()
+        uploaded_files_list = registry.get_uploaded_files()
+        
+        # Get process tracker statistics
+        process_tracker = get_process_tracker()
+        active_processes = process_tracker.get_active_processes()
+        
+        # Create response data
+        status_data = {
+            'downloads_count': downloads_count,
+            'analysis_count': analysis_count,
+            'upload_count': upload_count,
+            'uploaded_count': uploaded_count,
+            'processed_count': len(processed_files_list),
+            'uploaded_files_count': len(uploaded_files_list),
+            'processes': len(active_processes),
+            'timestamp': now_iso(),
+            'response_time_ms': int(timer.elapsed * 1000)
+        }
+        
+    # Log slow status collection
+    if timer.elapsed > 0.5:  # More than 500ms is slow
+        log_with_context(
+            logger.warning,
+            "Status collection was slow",
+            {
+                'time_ms': int(timer.elapsed * 1000),
+                'downloads_count': downloads_count,
+                'processes': len(active_processes)
+            }
+        )
+        
+    return status_data
+
+
+def _refresh_status():
+    """
+    Recompute the status in the background while clients keep polling.
+
+    The thread exits once no status request has arrived for
+    STATUS_IDLE_TIMEOUT seconds; the next request starts it again.
+    """
+    global _latest_status, _status_refresher
+    while not _status_stop.wait(STATUS_REFRESH_INTERVAL):
+        with _status_lock:
+            if time.monotonic() - _status_last_request > STATUS_IDLE_TIMEOUT:
+                _status_refresher = None
+                return
+        try:
+            status_data = _compute_status()
+        except Exception as e:
+            logger.error(f"Error refreshing system status: {str(e)}")
+            continue
+        with _status_lock:
+            _latest_status = status_data
+
+
+def _ensure_status_refresher():
+    """
+    Record a status request and start the refresher thread if needed.
+
+    Returns:
+        dict: Latest background status, or None if there is none yet
+    """
+    global _status_last_request, _status_refresher
+    with _status_lock:
+        _status_last_request = time.monotonic()
+        if _status_refresher is None:
+            _status_refresher = threading.Thread(
+                target=_refresh_status, name='status-refresher', daemon=True
+            )
+            _status_refresher.start()
+            # A stopped refresher may have left an old status behind
+            return None
+        return _latest_status
+
+
 @bp.route('/status')
 def status():
-    """Get system status with optimized file operations."""
+    """
+    Get system status.
+
+    The status is served from memory, refreshed every STATUS_REFRESH_INTERVAL
+    seconds by a background thread; pass fresh=1 to compute it synchronously.
+    """
+    global _latest_status
     try:
-        with Timer() as timer:
-            # Get path manager and registry
-            path_manager = get_path_manager()
-            registry = get_registry()
-            
-            # Use the file manager for more efficient file counting
-            downloads_files, _ = file_manager.get_files_in_directory(
-                path_manager.downloads_dir, 
-                page=1, 
-                per_page=1000,
-                filter_func=allowed_file
-            )
-            
-            analysis_files, _ = file_manager.get_files_in_directory(
-                path_manager.analysis_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: f.endswith('.json')
-            )
-            
-            upload_files, _ = file_manager.get_files_in_directory(
-                path_manager.upload_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: f != 'metadata' and allowed_file(f)
-            )
-            
-            uploaded_files, _ = file_manager.get_files_in_directory(
-                path_manager.uploaded_dir,
-                page=1,
-                per_page=1000,
-                filter_func=lambda f: not f.endswith('.json') and not f.endswith('.yml') and allowed_file(f)
-            )
-            
-            # Get registry statistics in parallel
-            processed_files_list = registry.get_processed_files()
-            uploaded_files_list = registry.get_uploaded_files()
-            
-            # Get process tracker statistics
-            process_tracker = get_process_tracker()
-            active_processes = process_tracker.get_active_processes()
-            
-            # Create response data
-            status_data = {
-                'downloads_count': len(downloads_files),
-                'analysis_count': len(analysis_files),
-                'upload_count': len(upload_files),
-                'uploaded_count': len(uploaded_files),
-                'processed_count': len(processed_files_list),
-                'uploaded_files_count': len(uploaded_files_list),
-                'processes': len(active_processes),
-                'timestamp': datetime.now().isoformat(),
-                'response_time_ms': int(timer.elapsed * 1000)
-            }
-            
-            # Log slow status requests
-            if timer.elapsed > 0.5:  # More than 500ms is slow
-                log_with_context(
-                    logger.warning,
-                    "Status API request was slow",
-                    {
-                        'time_ms': int(timer.elapsed * 1000),
-                        'downloads_count': len(downloads_files),
-                        'processes': len(active_processes)
-                    }
-                )
+        status_data = _ensure_status_refresher()
+        if status_data is None or request.args.get('fresh') == '1':
+            status_data = _compute_status()
+            with _status_lock:
+                _latest_status = status_data
                 
-            return jsonify(status_data)
+        return jsonify(status_data)
     except Exception as e:
         logger.error(f"Error getting system status: {str(e)}")
         return jsonify({
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }), 500
@@ -5,7 +5,9 @@ This module provides the photos views for the web interface.
 """
 
 import os
-import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, send_from_directory
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -14,6 +16,8 @@ from src.utils.config import get_config
 from src.utils.logging import get_logger, should_log_verbose, log_directory_contents
 from src.utils.paths import get_path_manager
 from src.utils.registry import get_registry
+from src.web.file_manager import UPLOAD_BUFFER_SIZE, FileManager, allowed_file, build_pagination, stat_files
+from src.web.utils import read_json_file
 
 # Get logger
 logger = get_logger('web.photos')
@@ -21,10 +25,21 @@ logger = get_logger('web.photos')
 # Create blueprint
 bp = Blueprint('photos', __name__, url_prefix='/photos')
 
-def allowed_file(filename):
-    """Check if a file has an allowed extension."""
-    ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp'}
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+# Initialize file manager
+file_manager = FileManager(get_path_manager())
+
+# Extensions tried, in order, when looking for the original of an analysed photo
+ORIGINAL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+
+# Photo listings by their main directory: (cached at, directory mtimes, files)
+_scan_cache = {}
+_scan_cache_lock = threading.Lock()
+
+# Seconds a photo listing is reused while its directories are unchanged
+SCAN_MAX_AGE = 60
+
+# Metadata sidecars are small files; reading many at once hides the latency
+_metadata_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='photo-metadata')
 
 def validate_image_content(file):
     """Validate that the file is actually an image by checking its content.
@@ -79,34 +94,138 @@ def validate_image_content(file):
         logger.error(f"Error validating image content: {str(e)}")
         return False
 
-@bp.route('/')
-@bp.route('/<tab>')
-def index(tab=None):
-    """Render the photos page with pagination."""
-    # Get path manager
-    path_manager = get_path_manager()
+def _dir_mtime(directory):
+    """
+    Get the mtime of a directory, or None if it does not exist.
 
-    # Добавляем логирование
-    logger.info(f"Запрос на отображение страницы с фотографиями, tab={tab}")
+    Args:
+        directory (str): Directory path
 
-    # Используем условное логирование для подробной информации
+    Returns:
+        int: Modification time in nanoseconds or None
+    """
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
 
-    # Determine active tab
-    active_tab = tab or request.args.get('tab', 'downloads')
-    if active_tab not in ['downloads', 'analyzed', 'upload_ready', 'uploaded']:
-        active_tab = 'downloads'
 
-    # Get page and items per page from query parameters
-    # Если вкладка указана в URL, то всегда показываем первую страницу
-    if tab:
-        page = 1
-    else:
-        page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 12, type=int)  # Default 12 items per page
+def _cached_scan(directories, scan, path_manager):
+    """
+    Get a photo listing, reusing the last result while its inputs are unchanged.
 
-    logger.debug(f"Активная вкладка: {active_tab}, страница: {page}, элементов на странице: {per_page}")
+    A listing is cached under the mtimes of every directory it is built
+    from, so while none of them has gained, lost or renamed an entry a
+    request costs one stat per directory. SCAN_MAX_AGE bounds how long
+    changes that leave directory mtimes alone (files rewritten in place)
+    can go unnoticed.
+
+    Args:
+        directories (tuple): Directories the listing is built from; the
+            first one names the listing
+        scan (callable): Listing function, called with the path manager
+        path_manager: Path manager
 
-    # Get photos from different directories
+    Returns:
+        list: File dicts
+    """
+    key = os.fspath(directories[0])
+    dir_mtimes = tuple(_dir_mtime(directory) for directory in directories)
+
+    now = time.monotonic()
+    with _scan_cache_lock:
+        entry = _scan_cache.get(key)
+    if entry is not None and entry[1] == dir_mtimes and now - entry[0] < SCAN_MAX_AGE:
+        return entry[2]
+
+    result = scan(path_manager)
+    with _scan_cache_lock:
+        _scan_cache[key] = (now, dir_mtimes, result)
+    return result
+
+
+def clear_scan_cache(directory=None):
+    """
+    Drop cached photo listings.
+
+    Args:
+        directory (str, optional): Only drop the listing of this directory
+
+    Returns:
+        None
+    """
+    with _scan_cache_lock:
+        if directory is None:
+            _scan_cache.clear()
+        else:
+            _scan_cache.pop(os.fspath(directory), None)
+
+
+def _json_names(directory):
+    """
+    Get the names of the JSON files in a directory.
+
+    Args:
+        directory (str): Directory path
+
+    Returns:
+        set: File names ending in .json (empty if the directory is missing)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.name.endswith('.json')}
+    except OSError as e:
+        logger.debug(f"Не удалось прочитать директорию метаданных {directory}: {str(e)}")
+        return set()
+
+
+def _read_metadata(path):
+    """
+    Read a metadata sidecar, logging instead of raising on errors.
+
+    Args:
+        path (str): Path to the JSON file
+
+    Returns:
+        dict: Metadata or None if it could not be read
+    """
+    try:
+        return read_json_file(path)
+    except Exception as e:
+        logger.error(f"Error loading metadata from {path}: {str(e)}")
+        return None
+
+
+def _load_metadata(items):
+    """
+    Load the metadata sidecars of displayed photos concurrently.
+
+    Args:
+        items (list): File dicts; 'metadata' is filled in for the entries
+            that have a 'metadata_path'
+
+    Returns:
+        None
+    """
+    pending = [item for item in items if item['metadata_path']]
+    if not pending:
+        return
+
+    paths = [item['metadata_path'] for item in pending]
+    for item, metadata in zip(pending, _metadata_pool.map(_read_metadata, paths)):
+        item['metadata'] = metadata
+
+
+def _list_downloads(path_manager):
+    """
+    List the downloaded photos, newest first.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        list: File dicts; 'modified' holds the raw mtime
+    """
     downloads = []
     if should_log_verbose(logger.name):
         logger.debug(f"Сканирование директории downloads: {path_manager.downloads_dir}")
@@ -119,92 +238,94 @@ def index(tab=None):
             logger.debug(f"Найдено изображений в downloads: {len(image_files)}")
 
             # Создаем список файлов с минимальным количеством системных вызовов
-            for entry in image_files:
-                # os.scandir предоставляет информацию о файле без дополнительных вызовов
-                stat_info = entry.stat()
+            stats = stat_files(path_manager.downloads_dir, image_files, follow_symlinks=True)
+            for entry, stat_info in zip(image_files, stats):
+                # Removed since it was listed
+                if stat_info is None:
+                    continue
+                size, mtime_ns = stat_info
                 downloads.append({
                     'name': entry.name,
                     'path': entry.path,
-                    'size': stat_info.st_size,
-                    'modified': datetime.fromtimestamp(stat_info.st_mtime)
+                    'size': size,
+                    'modified': mtime_ns / 1e9
                 })
-                logger.debug(f"Добавление файла: {entry.name}")
+                logger.debug("Добавление файла: %s", entry.name)
     except Exception as e:
         logger.error(f"Ошибка при сканировании директории downloads: {str(e)}")
 
+    return sorted(downloads, key=lambda x: x['modified'], reverse=True)
+
+
+def _original_photo_index(path_manager):
+    """
+    Map photo names to their original files in the photo directories.
+
+    A name maps to the file with exactly that name or with that name plus
+    an image extension. The processed directory wins over downloads, and
+    downloads over uploaded; within a directory the exact name wins, then
+    the extensions in ORIGINAL_EXTENSIONS order.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        dict: (original_path, original_filename) by photo name
+    """
+    originals = {}
+    for directory in (path_manager.processed_dir, path_manager.downloads_dir, path_manager.uploaded_dir):
+        directory = os.fspath(directory)
+
+        # Best candidate per photo name in this directory: (rank, filename)
+        best = {}
+        for name in file_manager.get_directory_names(directory):
+            candidates = [(name, 0)]
+            for rank, ext in enumerate(ORIGINAL_EXTENSIONS, 1):
+                if name.endswith(ext):
+                    candidates.append((name[:-len(ext)], rank))
+            for photo_name, rank in candidates:
+                if photo_name not in best or rank < best[photo_name][0]:
+                    best[photo_name] = (rank, name)
+
+        for photo_name, (rank, name) in best.items():
+            originals.setdefault(photo_name, (os.path.join(directory, name), name))
+
+    return originals
+
+
+def _list_analyzed(path_manager):
+    """
+    List the analysis results with their original photos, newest first.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        list: File dicts; 'modified' holds the raw mtime
+    """
     analyzed = []
     if should_log_verbose(logger.name):
         logger.debug(f"Сканирование директории analysis: {path_manager.analysis_dir}")
     try:
+        originals = _original_photo_index(path_manager)
+
         # Используем os.scandir для более эффективного сканирования
         with os.scandir(path_manager.analysis_dir) as entries:
             # Фильтруем только файлы с расширением .json
             json_files = [entry for entry in entries if entry.is_file() and entry.name.endswith('.json')]
             logger.debug(f"Найдено JSON файлов в analysis: {len(json_files)}")
 
-            for entry in json_files:
-                stat_info = entry.stat()
+            stats = stat_files(path_manager.analysis_dir, json_files, follow_symlinks=True)
+            for entry, stat_info in zip(json_files, stats):
+                # Removed since it was listed
+                if stat_info is None:
+                    continue
+                size, mtime_ns = stat_info
                 photo_name = entry.name.replace('_analysis.json', '')
-                logger.debug(f"Добавление файла анализа: {entry.name}")
-
-                # Создаем кэш для хранения найденных оригинальных файлов
-                if not hasattr(index, 'original_photo_cache'):
-                    index.original_photo_cache = {}
-
-                # Проверяем, есть ли файл в кэше
-                if photo_name in index.original_photo_cache:
-                    original_path, original_filename = index.original_photo_cache[photo_name]
-                else:
-                    # Try to find the original photo
-                    original_path = None
-                    original_filename = None
-
-                    # Сначала ищем в директории processed
-                    processed_path = os.path.join(path_manager.processed_dir, photo_name)
-                    if os.path.exists(processed_path):
-                        original_path = processed_path
-                        original_filename = photo_name
-                    else:
-                        # Пробуем с разными расширениями
-                        for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
-                            test_path = os.path.join(path_manager.processed_dir, photo_name + ext)
-                            if os.path.exists(test_path):
-                                original_path = test_path
-                                original_filename = photo_name + ext
-                                break
-
-                    # Сохраняем результат в кэш
-                    index.original_photo_cache[photo_name] = (original_path, original_filename)
-
-                # Если не нашли в processed, ищем в downloads
-                if not original_path:
-                    downloads_path = os.path.join(path_manager.downloads_dir, photo_name)
-                    if os.path.exists(downloads_path):
-                        original_path = downloads_path
-                        original_filename = photo_name
-                    else:
-                        # Пробуем с разными расширениями
-                        for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
-                            test_path = os.path.join(path_manager.downloads_dir, photo_name + ext)
-                            if os.path.exists(test_path):
-                                original_path = test_path
-                                original_filename = photo_name + ext
-                                break
-
-                # Если не нашли в downloads, ищем в uploaded
-                if not original_path:
-                    uploaded_path = os.path.join(path_manager.uploaded_dir, photo_name)
-                    if os.path.exists(uploaded_path):
-                        original_path = uploaded_path
-                        original_filename = photo_name
-                    else:
-                        # Пробуем с разными расширениями
-                        for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
-                            test_path = os.path.join(path_manager.uploaded_dir, photo_name + ext)
-                            if os.path.exists(test_path):
-                                original_path = test_path
-                                original_filename = photo_name + ext
-                                break
+                logger.debug("Добавление файла анализа: %s", entry.name)
+
+                # One dict lookup replaces probing every candidate name
+                original_path, original_filename = originals.get(photo_name, (None, None))
 
                 # Добавляем файл анализа в список
                 analyzed.append({
@@ -212,131 +333,232 @@ def index(tab=None):
                     'analysis_path': entry.path,
                     'original_path': original_path,
                     'original_filename': original_filename,
-                    'size': stat_info.st_size,
-                    'modified': datetime.fromtimestamp(stat_info.st_mtime)
+                    'size': size,
+                    'modified': mtime_ns / 1e9
                 })
     except Exception as e:
         logger.error(f"Ошибка при сканировании директории analysis: {str(e)}")
 
+    return sorted(analyzed, key=lambda x: x['modified'], reverse=True)
+
+
+def _list_upload_ready(path_manager):
+    """
+    List the photos ready for upload with their metadata, newest first.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        list: File dicts; 'modified' holds the raw mtime
+    """
     upload_ready = []
     if should_log_verbose(logger.name):
         logger.debug(f"Сканирование директории upload: {path_manager.upload_dir}")
     try:
+        # Metadata existence is a set lookup instead of a stat per photo
+        metadata_dir = os.fspath(path_manager.upload_metadata_dir)
+        metadata_names = _json_names(metadata_dir)
+
         # Используем os.scandir для более эффективного сканирования
         with os.scandir(path_manager.upload_dir) as entries:
             # Фильтруем только файлы с разрешенными расширениями
             image_files = [entry for entry in entries if entry.is_file() and allowed_file(entry.name)]
             logger.debug(f"Найдено изображений в upload: {len(image_files)}")
 
-            for entry in image_files:
-                stat_info = entry.stat()
-                logger.debug(f"Добавление файла для загрузки: {entry.name}")
+            stats = stat_files(path_manager.upload_dir, image_files, follow_symlinks=True)
+            for entry, stat_info in zip(image_files, stats):
+                # Removed since it was listed
+                if stat_info is None:
+                    continue
+                size, mtime_ns = stat_info
+                logger.debug("Добавление файла для загрузки: %s", entry.name)
 
                 # Check if metadata exists
-                metadata_path = os.path.join(path_manager.upload_metadata_dir, os.path.splitext(entry.name)[0] + '.json')
-                metadata = None
-                if os.path.exists(metadata_path):
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                    except Exception as e:
-                        logger.error(f"Error loading metadata for {entry.name}: {str(e)}")
+                metadata_name = os.path.splitext(entry.name)[0] + '.json'
+                metadata_path = None
+                if metadata_name in metadata_names:
+                    metadata_path = os.path.join(metadata_dir, metadata_name)
 
                 upload_ready.append({
                     'name': entry.name,
                     'path': entry.path,
-                    'metadata_path': metadata_path if os.path.exists(metadata_path) else None,
-                    'metadata': metadata,
-                    'size': stat_info.st_size,
-                    'modified': datetime.fromtimestamp(stat_info.st_mtime)
+                    'metadata_path': metadata_path,
+                    'metadata': None,
+                    'size': size,
+                    'modified': mtime_ns / 1e9
                 })
     except Exception as e:
         logger.error(f"Ошибка при сканировании директории upload: {str(e)}")
 
+    return sorted(upload_ready, key=lambda x: x['modified'], reverse=True)
+
+
+def _list_uploaded(path_manager):
+    """
+    List the uploaded photos with their metadata, newest first.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        list: File dicts; 'modified' holds the raw mtime
+    """
     uploaded = []
     if should_log_verbose(logger.name):
         logger.debug(f"Сканирование директории uploaded: {path_manager.uploaded_dir}")
     try:
+        uploaded_dir = os.fspath(path_manager.uploaded_dir)
+
         # Используем os.scandir для более эффективного сканирования
-        with os.scandir(path_manager.uploaded_dir) as entries:
+        with os.scandir(uploaded_dir) as entries:
+            entries = list(entries)
+
+            # Sidecars live next to the photos, so the same listing tells
+            # which metadata files exist
+            metadata_names = {entry.name for entry in entries if entry.name.endswith('.json')}
+
             # Фильтруем только файлы с разрешенными расширениями
             image_files = [entry for entry in entries if entry.is_file() and allowed_file(entry.name)]
             logger.debug(f"Найдено изображений в uploaded: {len(image_files)}")
 
-            for entry in image_files:
-                stat_info = entry.stat()
-                logger.debug(f"Добавление файла: {entry.name}")
+            stats = stat_files(uploaded_dir, image_files, follow_symlinks=True)
+            for entry, stat_info in zip(image_files, stats):
+                # Removed since it was listed
+                if stat_info is None:
+                    continue
+                size, mtime_ns = stat_info
+                logger.debug("Добавление файла: %s", entry.name)
 
                 # Check if metadata exists
-                metadata_path = os.path.join(path_manager.uploaded_dir, os.path.splitext(entry.name)[0] + '.json')
-                metadata = None
-                if os.path.exists(metadata_path):
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                    except Exception as e:
-                        logger.error(f"Error loading metadata for {entry.name}: {str(e)}")
+                metadata_name = os.path.splitext(entry.name)[0] + '.json'
+                metadata_path = None
+                if metadata_name in metadata_names:
+                    metadata_path = os.path.join(uploaded_dir, metadata_name)
 
                 uploaded.append({
                     'name': entry.name,
                     'path': entry.path,
-                    'metadata_path': metadata_path if os.path.exists(metadata_path) else None,
-                    'metadata': metadata,
-                    'size': stat_info.st_size,
-                    'modified': datetime.fromtimestamp(stat_info.st_mtime)
+                    'metadata_path': metadata_path,
+                    'metadata': None,
+                    'size': size,
+                    'modified': mtime_ns / 1e9
                 })
     except Exception as e:
         logger.error(f"Ошибка при сканировании директории uploaded: {str(e)}")
 
-    # Sort all lists by modified date (newest first)
-    downloads = sorted(downloads, key=lambda x: x['modified'], reverse=True)
-    analyzed = sorted(analyzed, key=lambda x: x['modified'], reverse=True)
-    upload_ready = sorted(upload_ready, key=lambda x: x['modified'], reverse=True)
-    uploaded = sorted(uploaded, key=lambda x: x['modified'], reverse=True)
-
-    # Create pagination for the active tab
-    if active_tab == 'downloads':
-        items = downloads
-    elif active_tab == 'analyzed':
-        items = analyzed
-    elif active_tab == 'upload_ready':
-        items = upload_ready
-    else:  # uploaded
-        items = uploaded
+    return sorted(uploaded, key=lambda x: x['modified'], reverse=True)
 
-    # Calculate pagination
-    total_items = len(items)
-    total_pages = (total_items + per_page - 1) // per_page  # Ceiling division
 
-    # Ensure page is within valid range
-    if page < 1:
+def _is_json_file(filename):
+    """Check if a file is a JSON file (an analysis result)."""
+    return filename.endswith('.json')
+
+
+def _tab_listings(path_manager):
+    """
+    Get the listing function of each photos tab and the directories it reads.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        dict: (listing function, directories) by tab name
+    """
+    return {
+        'downloads': (_list_downloads, (path_manager.downloads_dir,)),
+        'analyzed': (
+            _list_analyzed,
+            (path_manager.analysis_dir, path_manager.processed_dir, path_manager.downloads_dir, path_manager.uploaded_dir)
+        ),
+        'upload_ready': (_list_upload_ready, (path_manager.upload_dir, path_manager.upload_metadata_dir)),
+        'uploaded': (_list_uploaded, (path_manager.uploaded_dir,)),
+    }
+
+
+def _tab_count_sources(path_manager):
+    """
+    Get the directory and filter that give the size of each photos tab.
+
+    The filters match the ones the listing functions apply.
+
+    Args:
+        path_manager: Path manager
+
+    Returns:
+        dict: (directory, filter function) by tab name
+    """
+    return {
+        'downloads': (path_manager.downloads_dir, allowed_file),
+        'analyzed': (path_manager.analysis_dir, _is_json_file),
+        'upload_ready': (path_manager.upload_dir, allowed_file),
+        'uploaded': (path_manager.uploaded_dir, allowed_file),
+    }
+
+
+@bp.route('/')
+@bp.route('/<tab>')
+def index(tab=None):
+    """Render the photos page with pagination."""
+    # Get path manager
+    path_manager = get_path_manager()
+
+    # Добавляем логирование
+    logger.info(f"Запрос на отображение страницы с фотографиями, tab={tab}")
+
+    # Используем условное логирование для подробной информации
+
+    # Determine active tab
+    active_tab = tab or request.args.get('tab', 'downloads')
+    if active_tab not in ['downloads', 'analyzed', 'upload_ready', 'uploaded']:
+        active_tab = 'downloads'
+
+    # Get page and items per page from query parameters
+    # Если вкладка указана в URL, то всегда показываем первую страницу
+    if tab:
         page = 1
-    elif page > total_pages and total_pages > 0:
-        page = total_pages
+    else:
+        page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 12, type=int)  # Default 12 items per page
+
+    logger.debug(f"Активная вкладка: {active_tab}, страница: {page}, элементов на странице: {per_page}")
+
+    # Only the active tab is listed; listings are reused while the
+    # directories they are built from are unchanged
+    scan, directories = _tab_listings(path_manager)[active_tab]
+    items = _cached_scan(directories, scan, path_manager)
+
+    # The other tabs only show their size in the navigation
+    tab_counts = {active_tab: len(items)}
+    for other_tab, (directory, filter_func) in _tab_count_sources(path_manager).items():
+        if other_tab != active_tab:
+            tab_counts[other_tab] = file_manager.count_files_in_directory(
+                os.fspath(directory), filter_func, follow_symlinks=True
+            )
+
+    # Calculate pagination
+    total_items = len(items)
+    pagination = build_pagination(page, per_page, total_items)
+    page = pagination.page
 
     # Get items for current page
     start_idx = (page - 1) * per_page
     end_idx = min(start_idx + per_page, total_items)
     current_items = items[start_idx:end_idx] if items else []
 
-    # Create pagination info
-    pagination = {
-        'page': page,
-        'per_page': per_page,
-        'total_items': total_items,
-        'total_pages': total_pages,
-        'has_prev': page > 1,
-        'has_next': page < total_pages,
-        'prev_page': page - 1 if page > 1 else None,
-        'next_page': page + 1 if page < total_pages else None,
-        'pages': range(max(1, page - 2), min(total_pages + 1, page + 3))
-    }
+    # Convert modification times to datetime only for the displayed items;
+    # the listings may be cached, so they are copied rather than modified
+    current_items = [
+        dict(item, modified=datetime.fromtimestamp(item['modified']))
+        for item in current_items
+    ]
+
+    # Parse metadata sidecars only for the displayed photos
+    if active_tab in ('upload_ready', 'uploaded'):
+        _load_metadata(current_items)
 
     return render_template('photos/index.html',
-                          downloads=downloads,
-                          analyzed=analyzed,
-                          upload_ready=upload_ready,
-                          uploaded=uploaded,
+                          tab_counts=tab_counts,
                           active_tab=active_tab,
                           current_items=current_items,
                           pagination=pagination)
@@ -358,25 +580,32 @@ def upload():
     uploaded_count = 0
 
     for file in files:
-        if file and allowed_file(file.filename) and validate_image_content(file):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(path_manager.downloads_dir, filename)
-
-            # Save the file
-            file.save(file_path)
-            uploaded_count += 1
-            logger.info(f"Uploaded file: {filename}")
-        else:
-            if file and not allowed_file(file.filename):
-                logger.warning(f"Invalid file extension: {file.filename}")
-                flash(f"Invalid file extension: {file.filename}", "danger")
-            elif file and not validate_image_content(file):
-                logger.warning(f"Invalid image content: {file.filename}")
-                flash(f"File {file.filename} does not appear to be a valid image", "danger")
-            else:
-                logger.warning(f"Invalid file: {file.filename}")
+        # Each check runs once per file; a rejected file is not re-validated
+        # just to pick the error message
+        if not file:
+            logger.warning(f"Invalid file: {file.filename}")
+            continue
+
+        if not allowed_file(file.filename):
+            logger.warning(f"Invalid file extension: {file.filename}")
+            flash(f"Invalid file extension: {file.filename}", "danger")
+            continue
+
+        if not validate_image_content(file):
+            logger.warning(f"Invalid image content: {file.filename}")
+            flash(f"File {file.filename} does not appear to be a valid image", "danger")
+            continue
+
+        filename = secure_filename(file.filename)
+        file_path = os.path.join(path_manager.downloads_dir, filename)
+
+        # Save the file
+        file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
+        uploaded_count += 1
+        logger.info(f"Uploaded file: {filename}")
 
     if uploaded_count > 0:
+        clear_scan_cache(path_manager.downloads_dir)
         flash(f'Successfully uploaded {uploaded_count} photos', 'success')
     else:
         flash('No valid photos uploaded', 'warning')
@@ -417,9 +646,15 @@ def view_photo(filename):
         'processed_dir': path_manager.processed_dir
     }
 
+    # A bare name is looked up in the cached name sets of the directories
+    # (one stat each while they are unchanged); nested paths are probed
+    nested = os.sep in filename or '/' in filename
     for dir_name, dir_path in directories.items():
-        file_path = os.path.join(dir_path, filename)
-        if os.path.exists(file_path):
+        if nested:
+            found = os.path.exists(os.path.join(dir_path, filename))
+        else:
+            found = filename in file_manager.get_directory_names(str(dir_path))
+        if found:
             logger.info(f"Фото найдено в {dir_name}: {filename}")
             return send_from_directory(dir_path, filename)
 
@@ -448,8 +683,7 @@ def view_analysis(filename):
     # Если файл анализа существует в директории analysis
     if os.path.exists(analysis_path):
         try:
-            with open(analysis_path, 'r', encoding='utf-8') as f:
-                analysis = json.load(f)
+            analysis = read_json_file(analysis_path)
             logger.debug(f"Загружен файл анализа из директории analysis: {analysis_path}")
         except Exception as e:
             logger.error(f"Ошибка при загрузке файла анализа из директории analysis: {str(e)}")
@@ -460,24 +694,19 @@ def view_analysis(filename):
         uploaded_json_path = os.path.join(path_manager.uploaded_dir, os.path.splitext(filename)[0] + '.json')
         if os.path.exists(uploaded_json_path):
             try:
-                with open(uploaded_json_path, 'r', encoding='utf-8') as f:
-                    analysis = json.load(f)
+                analysis = read_json_file(uploaded_json_path)
                 logger.debug(f"Загружен файл метаданных из директории uploaded: {uploaded_json_path}")
             except Exception as e:
                 logger.error(f"Ошибка при загрузке файла метаданных из директории uploaded: {str(e)}")
 
     # Если анализ найден, ищем оригинальное фото
     if analysis:
-        # Ищем оригинальное фото в разных директориях
-        for dir_path in [path_manager.processed_dir, path_manager.downloads_dir, path_manager.uploaded_dir]:
-            for ext in ['', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
-                photo_path = os.path.join(dir_path, photo_name + ext)
-                if os.path.exists(photo_path):
-                    original_path = url_for('photos.view_photo', filename=photo_name + ext)
-                    logger.debug(f"Найдено оригинальное фото: {photo_path}")
-                    break
-            if original_path:
-                break
+        # Ищем оригинальное фото в разных директориях; the file manager
+        # checks the candidates against one cached listing per directory
+        photo_path, original_filename = file_manager.find_original_photo(photo_name)
+        if photo_path:
+            original_path = url_for('photos.view_photo', filename=original_filename)
+            logger.debug(f"Найдено оригинальное фото: {photo_path}")
 
         return render_template('photos/analysis.html',
                               filename=filename,
@@ -4,6 +4,7 @@ Processes views for the web interface.
 
 import os
 import json
+import signal
 import psutil
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
 from src.utils.process_tracker import get_process_tracker
@@ -119,9 +120,15 @@ def kill_process(pid):
         try:
             # Get process
             process = psutil.Process(int(pid))
-            # Kill process
-            process.kill()
-            logger.info(f"Process {pid} killed using psutil")
+            # Scripts started from the web interface lead their own process
+            # group; kill the whole group so their children do not linger
+            if os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, signal.SIGKILL)
+                logger.info(f"Process group {pid} killed")
+            else:
+                # Kill process
+                process.kill()
+                logger.info(f"Process {pid} killed using psutil")
         except Exception as e:
             logger.warning(f"Could not kill process {pid} using psutil: {str(e)}")
 
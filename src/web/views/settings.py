@@ -13,7 +13,7 @@ from datetime import datetime
 from src.utils.config import get_config, reload_config
 from src.utils.logging import get_logger
 from src.utils.paths import get_path_manager
-from src.web.file_cache import get_file_cache
+from src.web.file_cache import get_file_cache, get_negative_cache
 from src.utils.registry import get_registry
 from src.openai_analyzer import get_token_usage_stats, get_token_usage_history
 
@@ -402,6 +402,7 @@ def clear_cache():
 
         # Clear the cache
         file_cache.clear()
+        get_negative_cache().clear()
 
         # Get registry and clear it
         registry = get_registry()
@@ -450,6 +451,7 @@ def clean_all_data():
         # Clear the cache and registry
         file_cache = get_file_cache()
         file_cache.clear()
+        get_negative_cache().clear()
         registry = get_registry()
         registry.clear_registries()  # Clear registries instead of just reloading
 
@@ -0,0 +1,26 @@
+"""
+WSGI Entry Point
+
+This module exposes the Flask application for production WSGI servers.
+
+Usage:
+    gunicorn --preload --workers 1 --worker-class gthread --threads 8 \
+        --bind 0.0.0.0:5000 src.wsgi:app
+"""
+
+from src.web import create_app
+from src.utils.logging import get_logger
+from src.utils.registry import get_registry
+from src.utils.process_tracker import get_process_tracker
+
+# Get logger
+logger = get_logger('wsgi')
+
+# Create the application once, at import time, so that with --preload the
+# registry and process tracker JSON files are loaded a single time before
+# the worker is forked.
+app = create_app()
+registry = get_registry()
+process_tracker = get_process_tracker()
+
+logger.info("WSGI application preloaded")
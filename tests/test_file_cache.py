@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the web file cache.
+"""
+
+import unittest
+from unittest.mock import patch
+
+import unit_env  # noqa: F401  (sets up the import path and settings)
+from src.web.file_cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    """Tests for LRUCache expiry and eviction."""
+
+    def setUp(self):
+        """Control the clock the cache reads."""
+        self.now = 0
+        patcher = patch('src.web.file_cache.time.monotonic_ns', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def advance(self, seconds):
+        """Move the cache clock forward."""
+        self.now += int(seconds * 1_000_000_000)
+
+    def test_item_expires_after_ttl(self):
+        cache = LRUCache(max_size=10, ttl=5, shards=1)
+        cache.set('key', 'value')
+
+        self.advance(4.9)
+        self.assertEqual(cache.get('key'), 'value')
+
+        self.advance(0.1)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.get_stats()['size'], 0)
+
+    def test_set_renews_ttl(self):
+        cache = LRUCache(max_size=10, ttl=5, shards=1)
+        cache.set('key', 'old')
+        self.advance(3)
+        cache.set('key', 'new')
+
+        # The deadline of the first set must not evict the renewed entry
+        self.advance(3)
+        cache.set('other', 1)
+        self.assertEqual(cache.get('key'), 'new')
+
+    def test_set_sweeps_expired_entries(self):
+        cache = LRUCache(max_size=10, ttl=5, shards=1)
+        for i in range(5):
+            cache.set(i, i)
+
+        self.advance(6)
+        cache.set('fresh', True)
+        self.assertEqual(cache.get_stats()['size'], 1)
+
+    def test_zero_ttl_never_expires(self):
+        cache = LRUCache(max_size=10, ttl=0, shards=1)
+        cache.set('key', 'value')
+        self.advance(10 ** 6)
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=3, ttl=60, shards=1)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+
+        # Touch 'a' so 'b' becomes the oldest entry
+        self.assertEqual(cache.get('a'), 'a')
+        cache.set('d', 'd')
+
+        self.assertIsNone(cache.get('b'))
+        for key in ('a', 'c', 'd'):
+            self.assertEqual(cache.get(key), key)
+
+    def test_size_stays_within_bounds(self):
+        cache = LRUCache(max_size=64, ttl=60, shards=4)
+        for i in range(1000):
+            cache.set(f'key{i}', i)
+            self.assertLessEqual(cache.get_stats()['size'], 64)
+
+        for shard in cache.shards:
+            self.assertLessEqual(len(shard.cache), shard.max_size)
+            self.assertLessEqual(len(shard.expiry), shard.max_size)
+
+    def test_falsy_values_are_cached(self):
+        cache = LRUCache(max_size=10, ttl=60, shards=1)
+        cache.set('empty', [])
+        self.assertEqual(cache.get('empty', 'missing'), [])
+
+    def test_shards_must_be_power_of_two(self):
+        with self.assertRaises(ValueError):
+            LRUCache(shards=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
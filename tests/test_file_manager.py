@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for sidecar metadata loading in the web file manager.
+"""
+
+import os
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import unit_env  # noqa: F401  (sets up the import path and settings)
+from src.web.file_cache import get_file_cache, get_negative_cache
+from src.web.file_manager import FileManager
+
+
+class SidecarMetadataTest(unittest.TestCase):
+    """Tests for get_metadata_for_file and get_metadata_batch."""
+
+    def setUp(self):
+        """Create a photo directory without sidecars."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = self.tmp.name
+        for name in ('a.jpg', 'b.jpg'):
+            with open(os.path.join(self.directory, name), 'wb') as f:
+                f.write(b'\xFF\xD8\xFF')
+
+        get_file_cache().clear()
+        get_negative_cache().clear()
+        self.file_manager = FileManager(SimpleNamespace())
+        self.dir_mtime_ns = 1_000_000_000_000_000_000
+
+    def write_sidecar(self, photo, metadata, mtime_ns):
+        """Write the JSON sidecar of a photo with a given mtime."""
+        path = os.path.join(self.directory, os.path.splitext(photo)[0] + '.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        # Timestamps may be coarser than the test; make the change visible
+        self.dir_mtime_ns += 1_000_000_000
+        os.utime(self.directory, ns=(self.dir_mtime_ns, self.dir_mtime_ns))
+
+    def test_sidecar_seen_right_after_a_miss(self):
+        self.assertIsNone(self.file_manager.get_metadata_for_file('a.jpg', self.directory))
+
+        self.write_sidecar('a.jpg', {'title': 'A'}, 1_000_000_000)
+        self.assertEqual(self.file_manager.get_metadata_for_file('a.jpg', self.directory), {'title': 'A'})
+
+    def test_rewritten_sidecar_is_reloaded(self):
+        self.write_sidecar('a.jpg', {'title': 'old'}, 1_000_000_000)
+        self.assertEqual(self.file_manager.get_metadata_for_file('a.jpg', self.directory), {'title': 'old'})
+
+        self.write_sidecar('a.jpg', {'title': 'new'}, 2_000_000_000)
+        self.assertEqual(self.file_manager.get_metadata_for_file('a.jpg', self.directory), {'title': 'new'})
+
+    def test_batch_picks_up_new_sidecars(self):
+        self.assertEqual(
+            self.file_manager.get_metadata_batch(['a.jpg', 'b.jpg'], self.directory),
+            {'a.jpg': None, 'b.jpg': None}
+        )
+
+        self.write_sidecar('a.jpg', {'title': 'A'}, 1_000_000_000)
+        self.write_sidecar('b.jpg', {'title': 'B'}, 1_000_000_000)
+        self.assertEqual(
+            self.file_manager.get_metadata_batch(['a.jpg', 'b.jpg'], self.directory),
+            {'a.jpg': {'title': 'A'}, 'b.jpg': {'title': 'B'}}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for log line parsing in the web log viewer.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import unit_env  # noqa: F401  (sets up the import path and settings)
+from src.web.views.logs import _parse_log_line, _read_log_entries
+
+
+class ParseLogLineTest(unittest.TestCase):
+    """Tests for splitting log lines into their parts."""
+
+    def test_line_with_timestamp(self):
+        entry = _parse_log_line('2023-04-10 14:25:33,123 - src.web.app - INFO - Started')
+        self.assertEqual(entry, {
+            'timestamp': datetime(2023, 4, 10, 14, 25, 33, 123000),
+            'module': 'src.web.app',
+            'level': 'INFO',
+            'message': 'Started'
+        })
+
+    def test_message_keeps_separators(self):
+        entry = _parse_log_line('2023-04-10 14:25:33,123 - mod - ERROR - Failed - retrying')
+        self.assertEqual(entry['level'], 'ERROR')
+        self.assertEqual(entry['message'], 'Failed - retrying')
+
+    def test_invalid_date_keeps_parts(self):
+        entry = _parse_log_line('2023-13-45 14:25:33,123 - mod - WARNING - Odd clock')
+        self.assertIsNone(entry['timestamp'])
+        self.assertEqual(entry['module'], 'mod')
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['message'], 'Odd clock')
+
+    def test_unparseable_timestamp_keeps_parts(self):
+        for line in (
+            '2023-04-10 14:25:33 - mod - ERROR - No milliseconds',
+            '[worker-1] - mod - ERROR - No milliseconds',
+        ):
+            with self.subTest(line=line):
+                entry = _parse_log_line(line)
+                self.assertEqual(entry, {
+                    'timestamp': None,
+                    'module': 'mod',
+                    'level': 'ERROR',
+                    'message': 'No milliseconds'
+                })
+
+    def test_line_without_separators_is_raw(self):
+        line = 'Traceback (most recent call last):'
+        self.assertEqual(_parse_log_line(line), {
+            'timestamp': None,
+            'module': None,
+            'level': None,
+            'message': line
+        })
+
+
+class ReadLogEntriesTest(unittest.TestCase):
+    """Tests for reading the tail of a log file."""
+
+    def setUp(self):
+        """Create a temporary log directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_log(self, text):
+        """Write a log file and return its path."""
+        path = os.path.join(self.tmp.name, 'test.log')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_entries_newest_first(self):
+        path = self.write_log(
+            '2023-04-10 14:25:33,123 - mod - INFO - first\n'
+            '\n'
+            'bad - mod - ERROR - second\n'
+        )
+        entries, truncated = _read_log_entries(path)
+
+        self.assertFalse(truncated)
+        self.assertEqual([entry['message'] for entry in entries], ['second', 'first'])
+        self.assertEqual([entry['level'] for entry in entries], ['ERROR', 'INFO'])
+
+    def test_tail_drops_partial_first_line(self):
+        path = self.write_log('x' * 100 + '\n2023-04-10 14:25:33,123 - mod - INFO - last\n')
+        entries, truncated = _read_log_entries(path, tail_bytes=60)
+
+        self.assertTrue(truncated)
+        self.assertEqual([entry['message'] for entry in entries], ['last'])
+
+    def test_empty_file(self):
+        self.assertEqual(_read_log_entries(self.write_log('')), ([], False))
+
+
+if __name__ == '__main__':
+    unittest.main()
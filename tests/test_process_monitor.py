@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the web process monitor.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import unit_env  # noqa: F401  (sets up the import path and settings)
+from src.web import process_monitor
+from src.web.process_monitor import OutputBuffer, run_process
+
+
+class FakeTracker:
+    """Process tracker that records updates in memory."""
+
+    def __init__(self):
+        self.updates = []
+        self.updated = threading.Event()
+
+    def add_process(self, **kwargs):
+        pass
+
+    def update_process(self, pid, status=None, details=None):
+        self.updates.append((status, details or {}))
+        self.updated.set()
+
+    def wait_for_status(self, status, timeout=5):
+        """Wait until an update with the given status was recorded."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for update_status, details in self.updates:
+                if update_status == status:
+                    return details
+            self.updated.wait(0.1)
+            self.updated.clear()
+        raise AssertionError(f"No '{status}' update within {timeout} seconds: {self.updates}")
+
+
+class OutputBufferTest(unittest.TestCase):
+    """Tests for bounding output in memory and spilling the rest."""
+
+    def setUp(self):
+        """Create a directory for spill files."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spill_dir = self.tmp.name
+
+    def test_small_output_stays_in_memory(self):
+        buffer = OutputBuffer('small', max_size=10, spill_dir=self.spill_dir)
+        buffer.extend(b'hello')
+        buffer.close()
+
+        self.assertEqual(buffer.getvalue(), 'hello')
+        self.assertIsNone(buffer.spill_path)
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_old_output_spills_to_one_file(self):
+        buffer = OutputBuffer('script_1_stdout', max_size=10, spill_dir=self.spill_dir)
+        for _ in range(5):
+            buffer.extend(b'0123456789')
+        spill_file = buffer._spill_file
+        buffer.extend(b'x' * 30)
+
+        # The spill file is kept open between spills
+        self.assertIs(buffer._spill_file, spill_file)
+        self.assertLessEqual(len(buffer.data), 2 * buffer.max_size)
+
+        buffer.close()
+        self.assertIsNone(buffer._spill_file)
+        self.assertTrue(spill_file.closed)
+
+        self.assertEqual(os.path.dirname(buffer.spill_path), self.spill_dir)
+        self.assertTrue(os.path.basename(buffer.spill_path).startswith('script_1_stdout_'))
+        self.assertTrue(buffer.spill_path.endswith('.log'))
+        with open(buffer.spill_path, 'rb') as f:
+            spilled = f.read()
+        self.assertEqual(len(spilled), buffer.spilled)
+        self.assertEqual(spilled + bytes(buffer.data), b'0123456789' * 5 + b'x' * 30)
+
+        text = buffer.getvalue()
+        self.assertIn(f'{buffer.spilled} bytes of earlier output saved to {buffer.spill_path}', text)
+        self.assertTrue(text.endswith(bytes(buffer.data).decode()))
+
+    def test_spill_after_close_appends_to_same_file(self):
+        buffer = OutputBuffer('reopen', max_size=4, spill_dir=self.spill_dir)
+        buffer.extend(b'aaaaaaaaa')
+        buffer.close()
+        buffer.extend(b'bbbbbbbbb')
+        buffer.close()
+
+        self.assertEqual(len(os.listdir(self.spill_dir)), 1)
+        with open(buffer.spill_path, 'rb') as f:
+            self.assertEqual(f.read() + bytes(buffer.data), b'a' * 9 + b'b' * 9)
+
+
+class ProcessMonitorTest(unittest.TestCase):
+    """Tests for monitoring real child processes."""
+
+    def setUp(self):
+        """Send spill files to a temporary logs directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        config = SimpleNamespace(logs_dir=self.tmp.name)
+        patcher = patch.object(process_monitor, 'get_config', lambda: config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = FakeTracker()
+
+    def run_script(self, code):
+        """Run Python code in a monitored child process."""
+        return run_process([sys.executable, '-c', code], self.tracker, 'test_script')
+
+    def test_finished_process_closes_spill_file(self):
+        size = 3 * process_monitor.OUTPUT_TAIL_SIZE
+        process, monitor = self.run_script(f"import sys; sys.stdout.write('x' * {size})")
+
+        details = self.tracker.wait_for_status('finished')
+        self.assertTrue(process.stdout.closed)
+        self.assertIsNone(monitor.stdout_data._spill_file)
+        self.assertEqual(os.listdir(self.tmp.name), [os.path.basename(monitor.stdout_data.spill_path)])
+        self.assertEqual(monitor.stdout_data.spilled + len(monitor.stdout_data.data), size)
+        self.assertIn('bytes of earlier output saved to', details['stdout'])
+
+    def test_killed_process_closes_pipes(self):
+        process, monitor = self.run_script(
+            "import sys, time; print('started', flush=True); time.sleep(60)"
+        )
+        deadline = time.monotonic() + 5
+        while b'started' not in monitor.stdout_data.data and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        self.assertTrue(monitor.kill_process())
+        self.assertIsNotNone(process.returncode)
+        self.assertTrue(process.stdout.closed)
+        self.assertTrue(process.stderr.closed)
+
+        details = self.tracker.wait_for_status('killed')
+        self.assertIn('started', details['stdout'])
+
+        # A second kill finds the process gone and leaves the pipes alone
+        self.assertFalse(monitor.kill_process())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the file registry hash lookup.
+"""
+
+import json
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import xxhash
+
+import unit_env  # noqa: F401  (sets up the import path and settings)
+from src.utils import registry as registry_module
+from src.utils.registry import FileRegistry
+
+
+class FileRegistryHashTest(unittest.TestCase):
+    """Tests for finding files by hash across hash algorithms."""
+
+    def setUp(self):
+        """Create a registry in a temporary data directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data_dir = Path(self.tmp.name)
+        self.photos_dir = self.data_dir / "photos"
+        self.photos_dir.mkdir()
+        (self.data_dir / "registry").mkdir()
+
+        self.hash_algorithm = 'xxh3'
+        path_manager = SimpleNamespace(data_dir=self.data_dir)
+        for target, value in (
+            ('get_path_manager', lambda: path_manager),
+            ('get_config', lambda: SimpleNamespace(file=SimpleNamespace(hash_algorithm=self.hash_algorithm))),
+        ):
+            patcher = patch.object(registry_module, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write_photo(self, name, content=b'photo content'):
+        """Write a photo file and return its path."""
+        path = self.photos_dir / name
+        path.write_bytes(content)
+        return str(path)
+
+    def write_hashes(self, hashes):
+        """Write file_hashes.json as an older version would have."""
+        with open(self.data_dir / "registry" / "file_hashes.json", 'w') as f:
+            json.dump({"hashes": hashes, "last_updated": "2024-01-01T00:00:00"}, f)
+
+    def test_legacy_entry_found_for_renamed_file(self):
+        content = b'legacy photo'
+        legacy_hash = hashlib.md5(content).hexdigest()
+        self.write_hashes({legacy_hash: {"filename": "original.jpg", "timestamp": "", "metadata": {}}})
+        registry = FileRegistry()
+
+        renamed = self.write_photo("renamed copy.jpg", content)
+        info = registry.get_file_info_by_hash(renamed)
+
+        self.assertIsNotNone(info)
+        self.assertEqual(info["filename"], "original.jpg")
+
+        # The entry is migrated to the configured algorithm
+        hashes = registry.file_hashes["hashes"]
+        self.assertNotIn(legacy_hash, hashes)
+        self.assertEqual(hashes[xxhash.xxh3_128(content).hexdigest()]["algo"], 'xxh3')
+
+    def test_migrated_entry_survives_reload(self):
+        content = b'legacy photo'
+        self.write_hashes({hashlib.md5(content).hexdigest(): {"filename": "a.jpg", "timestamp": "", "metadata": {}}})
+        registry = FileRegistry()
+        photo = self.write_photo("a.jpg", content)
+        self.assertTrue(registry.is_file_processed_by_hash(photo))
+
+        registry.reload()
+        with patch.object(registry, 'calculate_file_hash', wraps=registry.calculate_file_hash) as calculate:
+            self.assertTrue(registry.is_file_processed_by_hash(photo))
+        self.assertEqual(calculate.call_count, 1)
+
+    def test_new_file_hashed_once_without_other_algorithms(self):
+        registry = FileRegistry()
+        registry.register_file_hash(self.write_photo("known.jpg", b'known'))
+
+        with patch.object(registry, 'calculate_file_hash', wraps=registry.calculate_file_hash) as calculate:
+            self.assertFalse(registry.is_file_processed_by_hash(self.write_photo("new.jpg", b'new')))
+        self.assertEqual(calculate.call_count, 1)
+
+    def test_new_file_checked_against_legacy_entries(self):
+        self.write_hashes({hashlib.md5(b'other').hexdigest(): {"filename": "other.jpg", "timestamp": "", "metadata": {}}})
+        registry = FileRegistry()
+
+        with patch.object(registry, 'calculate_file_hash', wraps=registry.calculate_file_hash) as calculate:
+            self.assertFalse(registry.is_file_processed_by_hash(self.write_photo("new.jpg", b'new')))
+        self.assertEqual([call.args[1:] for call in calculate.call_args_list], [(), ('md5',)])
+
+    def test_xxh3_entry_found_with_md5_configured(self):
+        content = b'recent photo'
+        self.write_hashes({
+            xxhash.xxh3_128(content).hexdigest(): {"filename": "recent.jpg", "timestamp": "", "algo": "xxh3", "metadata": {}}
+        })
+        self.hash_algorithm = 'md5'
+        registry = FileRegistry()
+
+        info = registry.get_file_info_by_hash(self.write_photo("recent.jpg", content))
+
+        self.assertIsNotNone(info)
+        self.assertEqual(registry.file_hashes["hashes"][hashlib.md5(content).hexdigest()]["algo"], 'md5')
+
+    def test_md5_used_without_xxhash(self):
+        with patch.object(registry_module, 'xxhash', None):
+            registry = FileRegistry()
+            photo = self.write_photo("photo.jpg", b'data')
+            file_hash = registry.register_file_hash(photo)
+
+        self.assertEqual(registry.hash_algorithm, 'md5')
+        self.assertEqual(file_hash, hashlib.md5(b'data').hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()
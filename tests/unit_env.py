@@ -0,0 +1,25 @@
+"""
+Environment for the unit tests.
+
+Importing this module adds the project to the import path and fills in
+placeholder values for the settings that src.utils.config requires, so
+modules can be imported without a configured .env file.
+"""
+
+import os
+import sys
+
+# Add project to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Required settings; real values from the environment take precedence
+for _var in (
+    "SHAREPOINT_SITE_URL",
+    "SHAREPOINT_USERNAME",
+    "SHAREPOINT_PASSWORD",
+    "SOURCE_LIBRARY_TITLE",
+    "SHAREPOINT_LIBRARY",
+    "METADATA_SCHEMA_FILE",
+    "OPENAI_API_KEY",
+):
+    os.environ.setdefault(_var, "test")